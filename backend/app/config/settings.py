@@ -18,11 +18,32 @@ class Settings(BaseSettings):
     
     # Database - Supabase PostgreSQL (required)
     database_url: str = Field(..., description="Supabase PostgreSQL connection string")
+
+    # Connection pool (PostgreSQL). Set DB_PGBOUNCER_MODE when connecting through
+    # Supabase's pooler / pgbouncer in transaction mode: it disables prepared statements.
+    db_pool_size: int = Field(default=10)
+    db_max_overflow: int = Field(default=20)
+    db_pool_timeout: float = Field(default=30.0)
+    db_pool_recycle: int = Field(default=1800)
+    db_statement_cache_size: int = Field(default=100)
+    db_pgbouncer_mode: bool = Field(default=False)
+    # Schema handling at startup: check (compare the Alembic revision, one query),
+    # upgrade (migrate to head under an advisory lock), create_all (legacy) or off.
+    db_schema_mode: str = Field(default="check")
     
     # Supabase Auth (for OAuth and user management)
     supabase_url: str = Field(default="https://example.supabase.co")
     supabase_anon_key: str = Field(default="your-anon-key")
     supabase_service_role_key: Optional[str] = Field(default=None)
+    # Supabase HTTP client (one pooled client per worker; HTTP/2 needs the 'h2' package)
+    supabase_max_connections: int = Field(default=50)
+    supabase_max_keepalive_connections: int = Field(default=20)
+    supabase_keepalive_expiry_seconds: float = Field(default=30.0)
+    supabase_http2: bool = Field(default=True)
+    supabase_max_retries: int = Field(default=2)
+    supabase_connect_timeout_seconds: float = Field(default=5.0)
+    supabase_auth_timeout_seconds: float = Field(default=10.0)
+    supabase_rest_timeout_seconds: float = Field(default=30.0)
     
     cors_origins: list[str] = Field(default=["http://localhost:3000", "http://localhost:5173"])
     
@@ -38,6 +59,84 @@ class Settings(BaseSettings):
     jwt_algorithm: str = Field(default="HS256")
     access_token_expire_minutes: int = Field(default=30)
     refresh_token_expire_days: int = Field(default=7)
+    # Revoked refresh-token families are re-synced from the DB this often; expired rows purged hourly
+    refresh_token_sync_seconds: float = Field(default=30.0)
+    refresh_token_purge_interval_seconds: float = Field(default=3600.0)
+    # Verified-token cache size per worker; 0 disables it
+    jwt_cache_max_entries: int = Field(default=10000)
+
+    # Where authenticated requests get the user's profile: "db", "claims" or "cache"
+    auth_profile_mode: str = Field(default="db")
+    auth_profile_cache_ttl_seconds: int = Field(default=300)
+    auth_profile_cache_max_entries: int = Field(default=10000)
+
+    # Gemini LLM client
+    gemini_api_key: Optional[str] = Field(default=None)
+    gemini_model: str = Field(default="gemini-2.5-flash")
+    gemini_base_url: str = Field(default="https://generativelanguage.googleapis.com")
+    llm_max_concurrency: int = Field(default=8)
+    llm_max_retries: int = Field(default=3)
+    llm_timeout_seconds: float = Field(default=60.0)
+    llm_circuit_failure_threshold: int = Field(default=5)
+    llm_circuit_reset_seconds: float = Field(default=30.0)
+
+    # ATS result cache ("memory", "database" or "none")
+    ats_cache_backend: str = Field(default="memory")
+    ats_cache_ttl_seconds: int = Field(default=7 * 24 * 3600)
+    ats_cache_max_entries: int = Field(default=2048)
+
+    # Resume/JD text extraction worker pool ("thread" or "process")
+    extraction_executor: str = Field(default="thread")
+    extraction_max_workers: int = Field(default=4)
+    extraction_max_queue: int = Field(default=16)
+    extraction_timeout_seconds: float = Field(default=30.0)
+    extraction_retry_after_seconds: int = Field(default=5)
+
+    # bcrypt password hashing worker pool (bcrypt releases the GIL, so threads scale with cores)
+    password_hash_max_workers: int = Field(default=4)
+    password_hash_max_queue: int = Field(default=64)
+    password_hash_retry_after_seconds: int = Field(default=2)
+
+    # Upload limits: larger uploads are rejected, mid-sized ones spill to a temp file
+    upload_max_bytes: int = Field(default=10 * 1024 * 1024)
+    upload_spill_threshold_bytes: int = Field(default=4 * 1024 * 1024)
+
+    # Local keyword pre-screen (0-100); resumes scoring below it skip the LLM. 0 disables it.
+    ats_prescore_threshold: float = Field(default=0.0)
+
+    # Batch ATS evaluation
+    ats_batch_max_resumes: int = Field(default=500)
+    ats_batch_concurrency: int = Field(default=8)
+    ats_batch_max_archive_bytes: int = Field(default=200 * 1024 * 1024)
+    # Total size of an archive's resumes once unpacked (compressed text expands many times over)
+    ats_batch_max_uncompressed_bytes: int = Field(default=256 * 1024 * 1024)
+
+    # Resume categorization
+    resume_batch_max_texts: int = Field(default=5000)
+    resume_batch_window_ms: float = Field(default=5.0)
+    resume_batch_max_size: int = Field(default=64)
+
+    # Resume categorizer models
+    resume_model_dir: Optional[str] = Field(default=None)
+    resume_model_load_mode: str = Field(default="lazy")  # lazy | eager
+    resume_model_mmap: bool = Field(default=True)
+    resume_model_watch_seconds: float = Field(default=0.0)
+
+    # Server-side proctoring: candidate camera frames (JPEG over WebSocket) are analyzed by
+    # worker processes running the gaze engine; each stream stays on one worker.
+    proctoring_workers: int = Field(default=0)  # 0 = one per CPU core
+    proctoring_max_streams_per_worker: int = Field(default=8)
+    proctoring_max_frame_bytes: int = Field(default=512 * 1024)
+    proctoring_start_mode: str = Field(default="lazy")  # lazy | eager
+    proctoring_start_timeout_seconds: float = Field(default=60.0)
+    proctoring_retry_after_seconds: int = Field(default=5)
+    proctoring_stats_window_seconds: float = Field(default=5.0)
+    # Directory of gaze_analyzer.py (defaults to the research folder) and the dlib landmark model
+    proctoring_analyzer_dir: Optional[str] = Field(default=None)
+    proctoring_predictor_path: Optional[str] = Field(default=None)
+    # Analyzer tuning, see the research README: detect_every > 1 tracks faces between detections
+    proctoring_detect_every: int = Field(default=1)
+    proctoring_detection_scale: float = Field(default=1.0)
 
 
 @lru_cache()
@@ -1,15 +1,55 @@
+"""
+Minimal async client for Supabase Auth and the PostgREST API.
+
+A single instance is created in the FastAPI lifespan and keeps one pooled
+`httpx.AsyncClient` (HTTP/2 when the `h2` package is installed) with explicit
+connection limits and per-endpoint timeouts. Idempotent calls are retried
+on connection errors and 429/5xx responses; every request's duration is
+recorded in the metrics registry. Pass ``transport=`` (e.g.
+``httpx.ASGITransport`` around a mock Supabase app) to test it offline.
+"""
+import asyncio
+import random
+import time
 import httpx
-from typing import Optional, Any
+from typing import Optional, Any, AsyncIterator, Iterable, Union
 from functools import lru_cache
+from urllib.parse import urlencode
 
 from app.config.settings import get_settings
 from app.config.logging import get_logger
+from app.utils import metrics
 
 logger = get_logger("db.connection")
 
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_BACKOFF_BASE = 0.2
+RETRY_BACKOFF_MAX = 2.0
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
 
 class SupabaseClient:
-    def __init__(self, url: str, key: str):
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        max_retries: int = 2,
+        connect_timeout: float = 5.0,
+        auth_timeout: float = 10.0,
+        rest_timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.url = url.rstrip("/")
         self.key = key
         self.headers = {
@@ -17,14 +57,35 @@ class SupabaseClient:
             "Authorization": f"Bearer {key}",
             "Content-Type": "application/json",
         }
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested for Supabase but the 'h2' package is missing; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.max_retries = max_retries
+        # Auth calls should fail fast; REST queries may legitimately take longer.
+        self.timeouts = {
+            "auth": httpx.Timeout(auth_timeout, connect=connect_timeout),
+            "rest": httpx.Timeout(rest_timeout, connect=connect_timeout),
+            "health": httpx.Timeout(connect_timeout),
+        }
+        self._transport = transport
         self._client: Optional[httpx.AsyncClient] = None
-    
+        self.retries = 0
+
     async def get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
                 base_url=self.url,
                 headers=self.headers,
-                timeout=30.0
+                timeout=self.timeouts["rest"],
+                limits=self.limits,
+                http2=self.http2,
+                transport=self._transport,
             )
         return self._client
     
@@ -32,13 +93,70 @@ class SupabaseClient:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
             self._client = None
-    
-    async def auth_sign_up(self, email: str, password: str, data: dict = None) -> dict:
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), RETRY_BACKOFF_MAX)
+            except ValueError:
+                pass
+        return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        endpoint: str = "rest",
+        idempotent: Optional[bool] = None,
+        access_token: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send one request through the shared client. Only the headers that
+        differ from the client defaults are passed (httpx merges them), and
+        idempotent requests (GET/HEAD/PUT/DELETE unless told otherwise) are
+        retried on transport errors and retryable status codes.
+        """
         client = await self.get_client()
+        if access_token is not None:
+            headers = {**(headers or {}), "Authorization": f"Bearer {access_token}"}
+        if idempotent is None:
+            idempotent = method.upper() in ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+        attempts = self.max_retries + 1 if idempotent else 1
+        duration = metrics.histogram(f"supabase.{endpoint}.seconds")
+
+        for attempt in range(attempts):
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, path, headers=headers, timeout=self.timeouts[endpoint], **kwargs
+                )
+            except httpx.TransportError as e:
+                duration.observe(time.perf_counter() - started)
+                if attempt == attempts - 1:
+                    raise
+                self.retries += 1
+                logger.warning(f"Supabase {method} {path} failed ({e!r}), retrying")
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            duration.observe(time.perf_counter() - started)
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < attempts - 1:
+                self.retries += 1
+                logger.warning(f"Supabase {method} {path} returned {response.status_code}, retrying")
+                await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                continue
+            return response
+
+    def stats(self) -> dict[str, Any]:
+        return {"http2": self.http2, "retries": self.retries}
+
+    async def auth_sign_up(self, email: str, password: str, data: dict = None) -> dict:
         payload = {"email": email, "password": password}
         if data:
             payload["data"] = data
-        response = await client.post("/auth/v1/signup", json=payload)
+        response = await self.request("POST", "/auth/v1/signup", endpoint="auth", json=payload)
         if response.status_code >= 400:
             error_data = response.json()
             error_msg = error_data.get("error_description") or error_data.get("msg") or error_data.get("message") or str(error_data)
@@ -46,9 +164,10 @@ class SupabaseClient:
         return response.json()
     
     async def auth_sign_in(self, email: str, password: str) -> dict:
-        client = await self.get_client()
-        response = await client.post(
+        response = await self.request(
+            "POST",
             "/auth/v1/token",
+            endpoint="auth",
             params={"grant_type": "password"},
             json={"email": email, "password": password}
         )
@@ -56,21 +175,21 @@ class SupabaseClient:
         return response.json()
     
     async def auth_sign_out(self, access_token: str) -> None:
-        client = await self.get_client()
-        headers = {**self.headers, "Authorization": f"Bearer {access_token}"}
-        await client.post("/auth/v1/logout", headers=headers)
+        # Logging out twice is harmless, so this POST may be retried.
+        await self.request(
+            "POST", "/auth/v1/logout", endpoint="auth", idempotent=True, access_token=access_token
+        )
     
     async def auth_get_user(self, access_token: str) -> dict:
-        client = await self.get_client()
-        headers = {**self.headers, "Authorization": f"Bearer {access_token}"}
-        response = await client.get("/auth/v1/user", headers=headers)
+        response = await self.request("GET", "/auth/v1/user", endpoint="auth", access_token=access_token)
         response.raise_for_status()
         return response.json()
     
     async def auth_refresh_token(self, refresh_token: str) -> dict:
-        client = await self.get_client()
-        response = await client.post(
+        response = await self.request(
+            "POST",
             "/auth/v1/token",
+            endpoint="auth",
             params={"grant_type": "refresh_token"},
             json={"refresh_token": refresh_token}
         )
@@ -78,29 +197,29 @@ class SupabaseClient:
         return response.json()
     
     async def auth_reset_password(self, email: str, redirect_to: str = None) -> None:
-        client = await self.get_client()
         payload = {"email": email}
         if redirect_to:
             payload["redirect_to"] = redirect_to
-        await client.post("/auth/v1/recover", json=payload)
+        await self.request("POST", "/auth/v1/recover", endpoint="auth", json=payload)
     
     async def auth_update_user(self, access_token: str, data: dict) -> dict:
-        client = await self.get_client()
-        headers = {**self.headers, "Authorization": f"Bearer {access_token}"}
-        response = await client.put("/auth/v1/user", headers=headers, json=data)
+        response = await self.request(
+            "PUT", "/auth/v1/user", endpoint="auth", access_token=access_token, json=data
+        )
         response.raise_for_status()
         return response.json()
     
     def get_oauth_url(self, provider: str, redirect_to: str, scopes: str = None) -> str:
-        url = f"{self.url}/auth/v1/authorize?provider={provider}&redirect_to={redirect_to}"
+        params = {"provider": provider, "redirect_to": redirect_to}
         if scopes:
-            url += f"&scopes={scopes}"
-        return url
+            params["scopes"] = scopes
+        return f"{self.url}/auth/v1/authorize?{urlencode(params)}"
     
     async def auth_exchange_code(self, code: str) -> dict:
-        client = await self.get_client()
-        response = await client.post(
+        response = await self.request(
+            "POST",
             "/auth/v1/token",
+            endpoint="auth",
             params={"grant_type": "authorization_code"},
             json={"auth_code": code}
         )
@@ -111,75 +230,265 @@ class SupabaseClient:
         return TableQuery(self, table_name)
 
 
+# Characters with a meaning inside PostgREST filter values; values containing
+# them are double-quoted in `in.(...)` lists.
+_POSTGREST_RESERVED = set(',.:()"\\ ')
+COUNT_MODES = ("exact", "planned", "estimated")
+
+
+def _format_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _format_list_item(value: Any) -> str:
+    text = _format_value(value)
+    if any(ch in _POSTGREST_RESERVED for ch in text):
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return text
+
+
+def _parse_count(content_range: Optional[str]) -> Optional[int]:
+    # "0-24/3573" or "*/3573"; the total is "*" when no count was requested.
+    if not content_range or "/" not in content_range:
+        return None
+    total = content_range.rsplit("/", 1)[1]
+    return int(total) if total.isdigit() else None
+
+
 class TableQuery:
+    """
+    PostgREST query builder. Filters are collected as (column, "op.value")
+    pairs and sent as query parameters, so httpx does all URL encoding.
+    """
+
     def __init__(self, client: SupabaseClient, table_name: str):
         self.client = client
         self.table_name = table_name
         self._select = "*"
-        self._filters: list[tuple[str, str, Any]] = []
+        self._count: Optional[str] = None
+        self._filters: list[tuple[str, str]] = []
         self._limit: Optional[int] = None
-        self._order: Optional[tuple[str, bool]] = None
-    
-    def select(self, columns: str = "*") -> "TableQuery":
+        self._offset: Optional[int] = None
+        self._order: list[str] = []
+
+    @property
+    def path(self) -> str:
+        return f"/rest/v1/{self.table_name}"
+
+    # ── select / filters ─────────────────────────────────────────
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "TableQuery":
+        """Choose columns; ``count`` ("exact", "planned" or "estimated") also returns the total row count."""
+        if count is not None and count not in COUNT_MODES:
+            raise ValueError(f"count must be one of {COUNT_MODES}")
         self._select = columns
+        self._count = count
         return self
-    
+
+    def filter(self, column: str, operator: str, value: Any) -> "TableQuery":
+        self._filters.append((column, f"{operator}.{_format_value(value)}"))
+        return self
+
     def eq(self, column: str, value: Any) -> "TableQuery":
-        self._filters.append((column, "eq", value))
+        return self.filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "TableQuery":
+        return self.filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "TableQuery":
+        return self.filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "TableQuery":
+        return self.filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "TableQuery":
+        return self.filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "TableQuery":
+        return self.filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "TableQuery":
+        return self.filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "TableQuery":
+        return self.filter(column, "ilike", pattern)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "TableQuery":
+        items = ",".join(_format_list_item(value) for value in values)
+        self._filters.append((column, f"in.({items})"))
         return self
-    
+
+    def is_(self, column: str, value: Optional[bool]) -> "TableQuery":
+        """``IS NULL`` / ``IS TRUE`` / ``IS FALSE``."""
+        return self.filter(column, "is", value)
+
+    # ── ordering / paging ────────────────────────────────────────
+    def order(self, column: str, desc: bool = False, nulls_first: Optional[bool] = None) -> "TableQuery":
+        """Add a sort key; call repeatedly for multi-column ordering."""
+        term = f"{column}.{'desc' if desc else 'asc'}"
+        if nulls_first is not None:
+            term += ".nullsfirst" if nulls_first else ".nullslast"
+        self._order.append(term)
+        return self
+
     def limit(self, count: int) -> "TableQuery":
         self._limit = count
         return self
-    
-    def order(self, column: str, desc: bool = False) -> "TableQuery":
-        self._order = (column, desc)
+
+    def offset(self, count: int) -> "TableQuery":
+        self._offset = count
         return self
-    
-    async def execute(self) -> dict:
-        http_client = await self.client.get_client()
-        url = f"/rest/v1/{self.table_name}?select={self._select}"
-        
-        for col, op, val in self._filters:
-            url += f"&{col}={op}.{val}"
-        
-        if self._limit:
-            url += f"&limit={self._limit}"
-        
+
+    def range(self, start: int, end: int) -> "TableQuery":
+        """Rows ``start`` to ``end`` inclusive, like PostgREST's Range header."""
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def _params(self, extra_filters: Iterable[tuple[str, str]] = (), limit: Optional[int] = None) -> list[tuple[str, str]]:
+        params: list[tuple[str, str]] = [("select", self._select)]
+        params.extend(self._filters)
+        params.extend(extra_filters)
         if self._order:
-            col, desc = self._order
-            url += f"&order={col}.{'desc' if desc else 'asc'}"
-        
-        response = await http_client.get(url)
-        response.raise_for_status()
-        return {"data": response.json()}
-    
-    async def insert(self, data: dict) -> dict:
-        http_client = await self.client.get_client()
-        response = await http_client.post(
-            f"/rest/v1/{self.table_name}",
-            json=data,
-            headers={**self.client.headers, "Prefer": "return=representation"}
+            params.append(("order", ",".join(self._order)))
+        limit = limit if limit is not None else self._limit
+        if limit is not None:
+            params.append(("limit", str(limit)))
+        if self._offset:
+            params.append(("offset", str(self._offset)))
+        return params
+
+    def _read_headers(self) -> Optional[dict[str, str]]:
+        return {"Prefer": f"count={self._count}"} if self._count else None
+
+    async def execute(self) -> dict:
+        """Run the query; returns ``{"data": rows, "count": total or None}``."""
+        response = await self.client.request(
+            "GET", self.path, params=self._params(), headers=self._read_headers()
         )
         response.raise_for_status()
-        return {"data": response.json()}
+        return {"data": response.json(), "count": _parse_count(response.headers.get("Content-Range"))}
+
+    async def pages(self, key: str = "id", page_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """
+        Stream the whole result set page by page using keyset pagination on
+        the unique, sortable column *key* (``key > last seen`` instead of
+        OFFSET), so each page costs the same no matter how deep it is.
+        Existing filters apply; any ``order``/``limit``/``offset`` is replaced.
+        """
+        query = TableQuery(self.client, self.table_name)
+        query._select = self._select
+        query._filters = list(self._filters)
+        query._order = [f"{key}.asc"]
+
+        last: Any = None
+        while True:
+            extra = [(key, f"gt.{_format_value(last)}")] if last is not None else []
+            response = await self.client.request(
+                "GET", self.path, params=query._params(extra, limit=page_size)
+            )
+            response.raise_for_status()
+            rows = response.json()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < page_size:
+                return
+            last = rows[-1][key]
+
+    # ── writes ───────────────────────────────────────────────────
+    async def _write(
+        self,
+        rows: Union[dict, list[dict]],
+        prefer: list[str],
+        params: list[tuple[str, str]],
+        returning: str,
+        chunk_size: Optional[int],
+    ) -> dict:
+        rows = [rows] if isinstance(rows, dict) else list(rows)
+        if not rows:
+            return {"data": []}
+        prefer = prefer + [f"return={returning}"]
+        columns: list[str] = []
+        if len({frozenset(row) for row in rows}) > 1:
+            # Rows with different keys: name the union of columns and let
+            # missing ones take their defaults instead of NULL.
+            columns = sorted({column for row in rows for column in row})
+            params = params + [("columns", ",".join(columns))]
+            prefer.append("missing=default")
+        headers = {"Prefer": ",".join(prefer)}
+
+        data: list[dict] = []
+        size = chunk_size or len(rows)
+        for start in range(0, len(rows), size):
+            response = await self.client.request(
+                "POST", self.path, params=params, json=rows[start:start + size], headers=headers
+            )
+            response.raise_for_status()
+            if returning == "representation":
+                data.extend(response.json())
+        return {"data": data}
+
+    async def insert(
+        self,
+        data: Union[dict, list[dict]],
+        returning: str = "representation",
+        chunk_size: Optional[int] = None,
+    ) -> dict:
+        """
+        Insert one row or many in a single request (or one per *chunk_size*
+        rows). Use ``returning="minimal"`` for bulk loads that don't need
+        the inserted rows back.
+        """
+        return await self._write(data, [], [], returning, chunk_size)
+
+    async def upsert(
+        self,
+        data: Union[dict, list[dict]],
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: bool = False,
+        returning: str = "representation",
+        chunk_size: Optional[int] = None,
+    ) -> dict:
+        """Insert or update rows matched on *on_conflict* (default: the primary key)."""
+        prefer = ["resolution=ignore-duplicates" if ignore_duplicates else "resolution=merge-duplicates"]
+        params = [("on_conflict", on_conflict)] if on_conflict else []
+        return await self._write(data, prefer, params, returning, chunk_size)
 
 
 _supabase_client: Optional[SupabaseClient] = None
 
 
-async def get_async_supabase_client() -> SupabaseClient:
+def init_supabase_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> SupabaseClient:
+    """Create the shared client; called from the lifespan so its pool outlives requests."""
     global _supabase_client
     if _supabase_client is None:
         settings = get_settings()
         _supabase_client = SupabaseClient(
             settings.supabase_url,
-            settings.supabase_anon_key
+            settings.supabase_anon_key,
+            max_connections=settings.supabase_max_connections,
+            max_keepalive_connections=settings.supabase_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_keepalive_expiry_seconds,
+            http2=settings.supabase_http2,
+            max_retries=settings.supabase_max_retries,
+            connect_timeout=settings.supabase_connect_timeout_seconds,
+            auth_timeout=settings.supabase_auth_timeout_seconds,
+            rest_timeout=settings.supabase_rest_timeout_seconds,
+            transport=transport,
         )
-        logger.info("Supabase client initialized")
+        metrics.register_gauge("supabase.client", _supabase_client.stats)
+        logger.info(f"Supabase client initialized (http2={_supabase_client.http2})")
     return _supabase_client
 
 
+async def get_async_supabase_client() -> SupabaseClient:
+    return _supabase_client if _supabase_client is not None else init_supabase_client()
+
+
 async def close_async_client() -> None:
     global _supabase_client
     if _supabase_client is not None:
@@ -191,8 +500,7 @@ async def close_async_client() -> None:
 async def check_db_health() -> dict:
     try:
         client = await get_async_supabase_client()
-        http_client = await client.get_client()
-        response = await http_client.get("/rest/v1/")
+        response = await client.request("GET", "/rest/v1/", endpoint="health")
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
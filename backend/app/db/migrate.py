@@ -0,0 +1,179 @@
+"""
+Schema migrations (Alembic) and the startup schema check.
+
+CLI, run from the backend directory:
+
+    python -m app.db.migrate upgrade [revision]   # default: head
+    python -m app.db.migrate downgrade <revision>
+    python -m app.db.migrate current | history | heads
+    python -m app.db.migrate stamp <revision>     # adopt a database built by create_all
+    python -m app.db.migrate revision -m "add column" [--autogenerate]
+    python -m app.db.migrate check                # exit 1 unless the database is at head
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.config.logging import get_logger
+from app.db.session import close_db, get_engine
+
+logger = get_logger("db.migrate")
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(ALEMBIC_INI), "migrations")
+VERSIONS_DIR = os.path.join(MIGRATIONS_DIR, "versions")
+REVISION_PATTERN = re.compile(r"^revision(?:: str)? = [\"']([^\"']+)[\"']", re.MULTILINE)
+DOWN_REVISION_PATTERN = re.compile(r"^down_revision(?:: [^=]+)? = [\"']([^\"']+)[\"']", re.MULTILINE)
+
+# Arbitrary constant key for pg_advisory_lock, so only one worker migrates at a time.
+MIGRATION_LOCK_ID = 727_411_019
+
+
+class SchemaOutOfDateError(RuntimeError):
+    pass
+
+
+def alembic_config(**attributes):
+    # Alembic is only imported when migrating or on the first version check.
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.attributes.update(attributes)
+    return config
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> Optional[str]:
+    """
+    Latest revision shipped with the code. The version files are scanned
+    directly rather than through Alembic's ScriptDirectory, which would import
+    Alembic and Mako and cost more than the check itself on every worker start.
+    """
+    revisions, parents = set(), set()
+    for filename in os.listdir(VERSIONS_DIR):
+        if not filename.endswith(".py"):
+            continue
+        with open(os.path.join(VERSIONS_DIR, filename)) as f:
+            source = f.read()
+        revision = REVISION_PATTERN.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = DOWN_REVISION_PATTERN.search(source)
+        if down is not None:
+            parents.add(down.group(1))
+    heads = revisions - parents
+    if len(heads) > 1:
+        raise RuntimeError(f"Multiple migration heads {sorted(heads)}; merge them with `alembic merge`")
+    return heads.pop() if heads else None
+
+
+async def current_revision() -> Optional[str]:
+    """Revision recorded in ``alembic_version``, or None if the database was never migrated."""
+    async with get_engine().connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except Exception:
+            return None
+        return result.scalar()
+
+
+async def check_schema() -> None:
+    """One query: raise `SchemaOutOfDateError` unless the database is at the head revision."""
+    current, head = await current_revision(), head_revision()
+    if current != head:
+        raise SchemaOutOfDateError(
+            f"Database schema is at revision {current or 'none'}, code expects {head}. "
+            "Run `python -m app.db.migrate upgrade` (or `stamp 0001` first for a database "
+            "created by create_all)."
+        )
+    logger.info(f"Database schema at revision {current}")
+
+
+async def upgrade_schema(revision: str = "head") -> None:
+    """
+    Upgrade on the app's engine. On PostgreSQL a session advisory lock makes
+    concurrent workers wait for the first one instead of migrating in parallel;
+    the rest then find nothing to do.
+    """
+    from alembic import command
+
+    def _upgrade(sync_conn):
+        config = alembic_config(connection=sync_conn, configure_logger=False)
+        command.upgrade(config, revision)
+
+    async with get_engine().connect() as conn:
+        postgresql = conn.dialect.name == "postgresql"
+        if postgresql:
+            await conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            # Session-level lock survives the commit; alembic needs to start its own transactions.
+            await conn.commit()
+        try:
+            await conn.run_sync(_upgrade)
+            await conn.commit()
+        finally:
+            if postgresql:
+                await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                await conn.commit()
+    logger.info(f"Database schema upgraded to {revision}")
+
+
+async def _check_and_close() -> None:
+    try:
+        await check_schema()
+    finally:
+        await close_db()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from alembic import command
+
+    parser = argparse.ArgumentParser(prog="python -m app.db.migrate", description="Database schema migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("upgrade").add_argument("revision", nargs="?", default="head")
+    sub.add_parser("downgrade").add_argument("revision")
+    sub.add_parser("stamp").add_argument("revision")
+    sub.add_parser("current")
+    sub.add_parser("history")
+    sub.add_parser("heads")
+    sub.add_parser("check")
+    revision = sub.add_parser("revision")
+    revision.add_argument("-m", "--message", required=True)
+    revision.add_argument("--autogenerate", action="store_true")
+    args = parser.parse_args(argv)
+
+    config = alembic_config()
+    if args.command == "upgrade":
+        command.upgrade(config, args.revision)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    elif args.command == "history":
+        command.history(config)
+    elif args.command == "heads":
+        command.heads(config)
+    elif args.command == "revision":
+        command.revision(config, message=args.message, autogenerate=args.autogenerate)
+    elif args.command == "check":
+        try:
+            asyncio.run(_check_and_close())
+        except SchemaOutOfDateError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Database schema is at head ({head_revision()})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
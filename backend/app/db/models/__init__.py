@@ -5,3 +5,5 @@ from app.db.models.organization import Organization
 from app.db.models.candidate import Candidate
 from app.db.models.job_role import JobRole
 from app.db.models.interview import Interview, InterviewQuestion, InterviewResponse
+from app.db.models.ats_cache import ATSResultCacheEntry
+from app.db.models.refresh_token import RefreshTokenRecord
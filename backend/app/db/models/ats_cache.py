@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, DateTime, JSON
+
+from app.db.session import Base
+from app.db.models.base import TimestampMixin
+
+
+class ATSResultCacheEntry(Base, TimestampMixin):
+    """Persisted ATS evaluation keyed by a content hash of its inputs."""
+
+    __tablename__ = "ats_result_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    prompt_version = Column(String(20), nullable=False)
+    model_name = Column(String(100), nullable=False)
+    result = Column(JSON, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<ATSResultCacheEntry(key={self.cache_key}, model={self.model_name})>"
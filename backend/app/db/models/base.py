@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Boolean, String
+from sqlalchemy import Column, DateTime, Boolean, String, Index
 from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
@@ -24,3 +24,13 @@ class BaseModel(Base, TimestampMixin, SoftDeleteMixin):
     
     def to_dict(self) -> dict:
         return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+
+
+def active_index(name: str, model, *columns, **kwargs) -> Index:
+    """
+    Partial index over rows with ``is_active = true``, for listings that
+    always hide soft-deleted rows. Queries must filter with
+    ``Model.is_active == True`` for the planner to pick it up.
+    """
+    predicate = model.is_active == True  # noqa: E712
+    return Index(name, *columns, postgresql_where=predicate, sqlite_where=predicate, **kwargs)
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, Text, Integer, Boolean, Float, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, String, Text, Integer, Boolean, Float, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 import enum
 
-from app.db.models.base import BaseModel
+from app.db.models.base import BaseModel, active_index
 
 
 class InterviewStatus(str, enum.Enum):
@@ -46,6 +46,20 @@ class Interview(BaseModel):
         return f"<Interview(id={self.id}, status={self.status})>"
 
 
+# Per-role leaderboard: WHERE job_role_id = ? AND is_active ORDER BY final_score DESC LIMIT n
+active_index(
+    "ix_interviews_role_final_score_active",
+    Interview, Interview.job_role_id, Interview.final_score.desc(),
+)
+# Per-role pipeline views filtered by status (pending / completed ...), newest first
+active_index(
+    "ix_interviews_role_status_active",
+    Interview, Interview.job_role_id, Interview.status, Interview.created_at.desc(),
+)
+# Candidate history, newest first; also serves the candidate_id foreign key
+Index("ix_interviews_candidate_created", Interview.candidate_id, Interview.created_at.desc())
+
+
 class InterviewQuestion(BaseModel):
     __tablename__ = "interview_questions"
     
@@ -64,6 +78,13 @@ class InterviewQuestion(BaseModel):
         return f"<InterviewQuestion(id={self.id}, type={self.question_type})>"
 
 
+# A role's question sheet in display order
+active_index(
+    "ix_interview_questions_role_order_active",
+    InterviewQuestion, InterviewQuestion.job_role_id, InterviewQuestion.order_index,
+)
+
+
 class InterviewResponse(BaseModel):
     __tablename__ = "interview_responses"
     
@@ -82,3 +103,8 @@ class InterviewResponse(BaseModel):
     
     def __repr__(self) -> str:
         return f"<InterviewResponse(id={self.id}, score={self.response_score})>"
+
+
+# All answers of one interview; the question_id index keeps question deletes from scanning
+Index("ix_interview_responses_interview_question", InterviewResponse.interview_id, InterviewResponse.question_id)
+Index("ix_interview_responses_question", InterviewResponse.question_id)
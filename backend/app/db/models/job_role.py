@@ -1,7 +1,7 @@
 from sqlalchemy import Column, String, Text, Integer, Boolean, Float, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 
-from app.db.models.base import BaseModel
+from app.db.models.base import BaseModel, active_index
 
 
 class JobRole(BaseModel):
@@ -28,3 +28,10 @@ class JobRole(BaseModel):
     
     def __repr__(self) -> str:
         return f"<JobRole(id={self.id}, title={self.title})>"
+
+
+# An organization's open roles, newest first
+active_index(
+    "ix_job_roles_org_created_active",
+    JobRole, JobRole.organization_id, JobRole.created_at.desc(),
+)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey
+
+from app.db.session import Base
+from app.db.models.base import TimestampMixin
+
+
+class RefreshTokenRecord(Base, TimestampMixin):
+    """
+    One issued refresh token. Tokens rotated from the same sign-in share a
+    `family_id`; presenting an already-used token revokes the whole family.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    jti = Column(String(36), primary_key=True)
+    family_id = Column(String(36), nullable=False, index=True)
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    used_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<RefreshTokenRecord(jti={self.jti}, family={self.family_id}, user={self.user_id})>"
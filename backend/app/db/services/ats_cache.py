@@ -0,0 +1,194 @@
+"""
+Content-addressed cache for ATS evaluation results.
+
+Results are keyed on a SHA-256 of the normalized resume text, the job
+description text, the prompt version and the model name, so re-scoring the
+same pair never reaches the LLM again until the entry expires or the prompt
+or model changes.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, select
+
+from app.config.settings import get_settings
+from app.config.logging import get_logger
+from app.db.session import get_session_maker
+from app.db.models.ats_cache import ATSResultCacheEntry
+from app.utils.cache import TTLCache
+
+logger = get_logger("db.services.ats_cache")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so layout-only differences share a cache key."""
+    return " ".join(text.split())
+
+
+def make_cache_key(resume_text: str, job_desc_text: str, prompt_version: str, model_name: str) -> str:
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, normalize_text(resume_text), normalize_text(job_desc_text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class MemoryCacheBackend:
+    """In-process LRU with TTL; each worker keeps its own copy."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: dict, prompt_version: str, model_name: str) -> None:
+        self._cache.set(key, value)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._cache)
+
+
+class DatabaseCacheBackend:
+    """Shared cache stored in the `ats_result_cache` table (SQLite or Postgres)."""
+
+    name = "database"
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            result = await session.execute(
+                select(ATSResultCacheEntry.result, ATSResultCacheEntry.expires_at)
+                .where(ATSResultCacheEntry.cache_key == key)
+            )
+            row = result.first()
+            if row is None:
+                return None
+            expires_at = row.expires_at
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if expires_at <= now:
+                await session.execute(
+                    delete(ATSResultCacheEntry).where(ATSResultCacheEntry.cache_key == key)
+                )
+                await session.commit()
+                return None
+            return row.result
+
+    async def set(self, key: str, value: dict, prompt_version: str, model_name: str) -> None:
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            await session.merge(
+                ATSResultCacheEntry(
+                    cache_key=key,
+                    prompt_version=prompt_version,
+                    model_name=model_name,
+                    result=value,
+                    expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds),
+                )
+            )
+            await session.commit()
+
+    async def clear(self) -> None:
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            await session.execute(delete(ATSResultCacheEntry))
+            await session.commit()
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class NullCacheBackend:
+    """Disables caching while keeping the counters meaningful."""
+
+    name = "none"
+
+    async def get(self, key: str) -> Optional[dict]:
+        return None
+
+    async def set(self, key: str, value: dict, prompt_version: str, model_name: str) -> None:
+        return None
+
+    async def clear(self) -> None:
+        return None
+
+    def size(self) -> Optional[int]:
+        return 0
+
+
+class ATSResultCache:
+    """Backend-agnostic front for ATS results with hit/miss counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[dict]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            # A broken cache must never fail an evaluation — treat it as a miss.
+            self.errors += 1
+            logger.warning(f"ATS cache lookup failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: dict, prompt_version: str, model_name: str) -> None:
+        try:
+            await self.backend.set(key, value, prompt_version, model_name)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"ATS cache store failed: {e}")
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "entries": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_ats_cache: Optional[ATSResultCache] = None
+
+
+def get_ats_cache() -> ATSResultCache:
+    global _ats_cache
+    if _ats_cache is None:
+        settings = get_settings()
+        backend_name = settings.ats_cache_backend.lower()
+        if backend_name == "database":
+            backend = DatabaseCacheBackend(ttl_seconds=settings.ats_cache_ttl_seconds)
+        elif backend_name == "none":
+            backend = NullCacheBackend()
+        else:
+            backend = MemoryCacheBackend(
+                max_entries=settings.ats_cache_max_entries,
+                ttl_seconds=settings.ats_cache_ttl_seconds,
+            )
+        _ats_cache = ATSResultCache(backend)
+        logger.info(f"ATS result cache initialized with '{backend.name}' backend")
+    return _ats_cache
@@ -0,0 +1,156 @@
+"""
+Deterministic local ATS pre-scorer.
+
+Scores a resume against a job description with BM25-style keyword overlap
+plus the job role's required/preferred skills, in a few milliseconds and
+without any network call. Resumes scoring below `ats_prescore_threshold`
+are answered locally and never reach the LLM.
+"""
+import math
+from collections import Counter
+from typing import Iterable, Optional
+
+from app.utils.text_cleaning import clean_resume_text
+
+# Function words plus the boilerplate that appears in almost every job ad.
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further
+had has have having he her here hers him his how i if in into is it its itself just me more most
+my no nor not now of off on once only or other our ours out over own per same she should so some
+such than that the their them then there these they this those through to too under until up
+upon us very via was we were what when where which while who whom why will with within without
+would you your yours
+ability able candidate candidates company day excellent experience experienced good great ideal
+including job join knowledge looking must new plus preferred provide required requirement
+requirements responsibilities responsibility role skill skills strong team teams understanding
+work working year years
+""".split())
+
+# BM25 term-frequency saturation parameters; resumes are scored against a
+# typical resume length since there is no corpus to average over.
+BM25_K1 = 1.2
+BM25_B = 0.75
+AVG_RESUME_TOKENS = 600
+
+MAX_JD_KEYWORDS = 40
+MAX_MISSING_KEYWORDS = 20
+
+# Contribution of each component when the job role defines skills.
+KEYWORD_WEIGHT = 0.5
+REQUIRED_SKILLS_WEIGHT = 0.4
+PREFERRED_SKILLS_WEIGHT = 0.1
+
+
+def tokenize(text: str) -> list[str]:
+    """Keyword tokens: cleaned with the categorizer's cleaner, minus stopwords."""
+    return [
+        token for token in clean_resume_text(text).split()
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _normalize_skill(skill: str) -> str:
+    # Same cleaning as the resume side, so "Node.js" matches "node js".
+    return clean_resume_text(skill)
+
+
+class JobProfile:
+    """Everything about a job description the pre-scorer needs, computed once per JD."""
+
+    def __init__(
+        self,
+        job_desc_text: str,
+        required_skills: Optional[Iterable[str]] = None,
+        preferred_skills: Optional[Iterable[str]] = None,
+    ):
+        counts = Counter(tokenize(job_desc_text))
+        # Sub-linear weighting so a term repeated ten times doesn't dominate.
+        weighted = [(term, 1.0 + math.log(tf)) for term, tf in counts.items()]
+        weighted.sort(key=lambda item: (-item[1], item[0]))
+        self.keywords = weighted[:MAX_JD_KEYWORDS]
+        self.total_weight = sum(weight for _, weight in self.keywords)
+        self.required_skills = [s for s in map(_normalize_skill, required_skills or []) if s]
+        self.preferred_skills = [s for s in map(_normalize_skill, preferred_skills or []) if s]
+
+
+class PreScore:
+    def __init__(self, score: float, missing_keywords: list[str]):
+        self.score = score
+        self.missing_keywords = missing_keywords
+
+    def to_dict(self) -> dict:
+        return {"score": self.score, "missing_keywords": self.missing_keywords}
+
+
+def _skill_coverage(skills: list[str], tokens: Counter, padded_text: str) -> tuple[float, list[str]]:
+    missing = []
+    for skill in skills:
+        if " " in skill:
+            present = f" {skill} " in padded_text
+        else:
+            present = skill in tokens
+        if not present:
+            missing.append(skill)
+    if not skills:
+        return 1.0, missing
+    return (len(skills) - len(missing)) / len(skills), missing
+
+
+def prescore(resume_text: str, profile: JobProfile) -> PreScore:
+    """Score *resume_text* against *profile* on a 0–100 scale."""
+    resume_tokens = clean_resume_text(resume_text).split()
+    counts = Counter(resume_tokens)
+    length_norm = 1 - BM25_B + BM25_B * (len(resume_tokens) / AVG_RESUME_TOKENS)
+
+    matched_weight = 0.0
+    missing_keywords = []
+    for term, weight in profile.keywords:
+        tf = counts.get(term, 0)
+        if tf:
+            # BM25 saturation rescaled so that a well-covered term approaches 1.
+            matched_weight += weight * (tf * (BM25_K1 + 1)) / (tf + BM25_K1 * length_norm) / (BM25_K1 + 1)
+        else:
+            missing_keywords.append(term)
+    keyword_score = matched_weight / profile.total_weight if profile.total_weight else 0.0
+
+    if profile.required_skills or profile.preferred_skills:
+        padded_text = f" {' '.join(resume_tokens)} "
+        required_score, missing_required = _skill_coverage(profile.required_skills, counts, padded_text)
+        preferred_score, missing_preferred = _skill_coverage(profile.preferred_skills, counts, padded_text)
+        score = (
+            KEYWORD_WEIGHT * keyword_score
+            + REQUIRED_SKILLS_WEIGHT * required_score
+            + PREFERRED_SKILLS_WEIGHT * preferred_score
+        )
+        seen = set()
+        ordered = []
+        for keyword in missing_required + missing_preferred + missing_keywords:
+            if keyword not in seen:
+                seen.add(keyword)
+                ordered.append(keyword)
+        missing_keywords = ordered
+    else:
+        score = keyword_score
+
+    return PreScore(round(min(score, 1.0) * 100, 1), missing_keywords[:MAX_MISSING_KEYWORDS])
+
+
+def screened_out_result(result: PreScore, threshold: float) -> dict:
+    """Build an LLM-shaped ATS response for a resume rejected by the pre-scorer."""
+    suggestions = []
+    if result.missing_keywords:
+        suggestions.append(
+            "Mention the missing skills and keywords where they genuinely apply: "
+            + ", ".join(result.missing_keywords[:10])
+        )
+    suggestions.append("Tailor the resume summary and experience bullets to the job description.")
+    return {
+        "percentage_match": f"{round(result.score)}%",
+        "missing_keywords": result.missing_keywords,
+        "suggestions": suggestions,
+        "final_thoughts": (
+            f"The resume scored {result.score} in the local keyword pre-screen, below the "
+            f"shortlisting threshold of {threshold}, so it was not sent for a full AI evaluation."
+        ),
+    }
@@ -1,31 +1,67 @@
-import os
+import io
 import json
+import codecs
 import fitz
 from docx import Document
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.config.settings import get_settings
+from app.db.services.ats_cache import get_ats_cache, make_cache_key
+from app.db.services.ats_prescorer import JobProfile, prescore, screened_out_result
+from app.db.services.llm_client import LLMClientError, get_llm_client
+from app.utils.worker_pool import WorkerPool
 
-# We try to import google-genai, fallback to older module if needed, although user specifically asked for latest.
-try:
-    from google import genai
-    from google.genai import types
-except ImportError:
-    import google.generativeai as genai
-    
-def extract_text(file_path):
-    file_extension = file_path.split(".")[-1].lower()
+# Bump ATS_PROMPT_VERSION whenever the prompt below changes so cached results
+# produced by the old prompt are no longer served.
+ATS_PROMPT_VERSION = "v1"
+
+TEXT_CHUNK_SIZE = 64 * 1024
+
+
+def _decode_utf8_stream(stream):
+    """Decode a binary stream chunk by chunk without holding the raw bytes."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    while True:
+        chunk = stream.read(TEXT_CHUNK_SIZE)
+        if not chunk:
+            break
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+def extract_text(source, filename=None):
+    """
+    Extract plain text from a PDF, DOCX or TXT document.
+
+    `source` may be a filesystem path, the raw file bytes or a binary
+    file-like object; for the latter two the format is taken from `filename`.
+    """
+    name = filename or (source if isinstance(source, str) else "")
+    file_extension = name.split(".")[-1].lower()
     try:
-        if file_extension == "pdf": 
-            doc = fitz.open(file_path)
+        if file_extension == "pdf":
+            if isinstance(source, str):
+                doc = fitz.open(source)
+            else:
+                data = source if isinstance(source, (bytes, bytearray)) else source.read()
+                doc = fitz.open(stream=data, filetype="pdf")
             # PyMuPDF extraction
-            text = " ".join([page.get_text() for page in doc])
+            with doc:
+                text = " ".join([page.get_text() for page in doc])
         elif file_extension in ["docx", "doc"]:
-            doc = Document(file_path)
+            if isinstance(source, (bytes, bytearray)):
+                source = io.BytesIO(source)
+            doc = Document(source)
             text = " ".join([para.text for para in doc.paragraphs])
         elif file_extension == "txt":
-            with open(file_path, "r", encoding="utf-8") as file:
-                text = file.read()
+            if isinstance(source, str):
+                with open(source, "rb") as file:
+                    text = _decode_utf8_stream(file)
+            elif isinstance(source, (bytes, bytearray)):
+                text = bytes(source).decode("utf-8")
+            else:
+                text = _decode_utf8_stream(source)
         else:
             print("Unsupported format. Use PDF, DOCX, or TXT.")
             return None
@@ -34,7 +70,43 @@ def extract_text(file_path):
         print(f"Text extraction error: {e}")
         return None
 
-def get_ats_score(resume_text, job_desc_text):
+_extraction_pool = None
+
+
+def get_extraction_pool():
+    global _extraction_pool
+    if _extraction_pool is None:
+        settings = get_settings()
+        _extraction_pool = WorkerPool(
+            "extraction",
+            kind=settings.extraction_executor,
+            max_workers=settings.extraction_max_workers,
+            max_queue=settings.extraction_max_queue,
+            retry_after_seconds=settings.extraction_retry_after_seconds,
+        )
+    return _extraction_pool
+
+
+def shutdown_extraction_pool():
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown()
+        _extraction_pool = None
+
+
+async def extract_text_async(source, filename=None):
+    """
+    Run `extract_text` on the bounded extraction pool so PyMuPDF/python-docx
+    never block the event loop. Raises `PoolSaturatedError` when the pool is
+    full and `asyncio.TimeoutError` when one document takes too long.
+    """
+    settings = get_settings()
+    return await get_extraction_pool().run(
+        extract_text, source, filename, timeout=settings.extraction_timeout_seconds
+    )
+
+
+async def get_ats_score(resume_text, job_desc_text):
     prompt = f"""You are a skilled Human Resource ATS scanner. Evaluate the resume against the job description. 
 Provide the percentage match, followed by missing keywords, final thoughts, and concrete suggestions for improvement.
 
@@ -55,33 +127,47 @@ Return the response strictly in JSON format as follows:
 }}
 """
     try:
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            return {"error": "API key not found"}
-            
-        try:
-            # New google-genai 1.0+ SDK usage
-            client = genai.Client(api_key=api_key)
-            response = client.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=prompt
-            )
-            text_response = response.text
-        except Exception:
-             # Fallback to the older syntax just in case package resolution was partial
-             genai.configure(api_key=api_key)
-             model = genai.GenerativeModel("gemini-2.5-flash")
-             response = model.generate_content([prompt])
-             text_response = response.text if response else None
-             
-        if not text_response:
-             return {"error": "No Response from API"}
-             
-        # Clean up JSON formatting from the LLM (remove markdown if it included it)
-        text_response = text_response.replace("```json", "").replace("```", "").strip()
-        try:
-            return json.loads(text_response)
-        except json.JSONDecodeError:
-            return {"error": "Failed to parse API response into JSON", "raw_response": text_response}
+        text_response = await get_llm_client().generate(prompt)
+    except LLMClientError as e:
+        return {"error": str(e)}
     except Exception as e:
         return {"error": f"API error: {str(e)}"}
+
+    if not text_response:
+        return {"error": "No Response from API"}
+
+    # Clean up JSON formatting from the LLM (remove markdown if it included it)
+    text_response = text_response.replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(text_response)
+    except json.JSONDecodeError:
+        return {"error": "Failed to parse API response into JSON", "raw_response": text_response}
+
+
+async def score_resume(resume_text, job_desc_text, job_profile=None):
+    """
+    Return the ATS evaluation for the pair.
+
+    Resumes below `ats_prescore_threshold` in the local pre-screen are answered
+    without the LLM; the rest are served from the result cache or scored by
+    Gemini. Pass a prebuilt `JobProfile` to avoid re-tokenizing the JD (batches).
+    """
+    threshold = get_settings().ats_prescore_threshold
+    if threshold > 0:
+        profile = job_profile or JobProfile(job_desc_text)
+        local = prescore(resume_text, profile)
+        if local.score < threshold:
+            return screened_out_result(local, threshold)
+
+    cache = get_ats_cache()
+    model_name = get_llm_client().model
+    key = make_cache_key(resume_text, job_desc_text, ATS_PROMPT_VERSION, model_name)
+    cached = await cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = await get_ats_score(resume_text, job_desc_text)
+    # Only successful evaluations are cached; errors should be retried.
+    if isinstance(result, dict) and "error" not in result:
+        await cache.set(key, result, ATS_PROMPT_VERSION, model_name)
+    return result
@@ -5,6 +5,7 @@ Sign-up / sign-in create rows in the `users` table and return
 locally-minted JWT access + refresh tokens.  No external auth
 provider (Supabase Auth, etc.) is required.
 """
+import time
 from typing import Optional
 
 from sqlalchemy import select
@@ -14,9 +15,19 @@ from app.config.settings import get_settings
 from app.config.logging import get_logger
 from app.db.session import get_session_maker
 from app.db.models.user import User, UserType
+from app.db.services.token_store import get_token_store
+from app.db.services.user_profiles import (
+    invalidate_profile,
+    profile_claims,
+    resolve_profile,
+    user_to_profile,
+)
+from app.utils import metrics
+from app.utils.worker_pool import WorkerPool
 from app.utils.security import (
     create_access_token,
     create_refresh_token,
+    revoke_token,
     verify_access_token,
     verify_refresh_token,
 )
@@ -30,6 +41,31 @@ from app.schemas.auth import (
 
 logger = get_logger("db.services.auth")
 
+# Queue wait plus hashing time of each bcrypt call on the password pool.
+password_hash_time = metrics.histogram("password_hash.seconds")
+
+_password_pool: Optional[WorkerPool] = None
+
+
+def get_password_pool() -> WorkerPool:
+    global _password_pool
+    if _password_pool is None:
+        settings = get_settings()
+        _password_pool = WorkerPool(
+            "password_hash",
+            max_workers=settings.password_hash_max_workers,
+            max_queue=settings.password_hash_max_queue,
+            retry_after_seconds=settings.password_hash_retry_after_seconds,
+        )
+        metrics.register_gauge("password_hash.pool", _password_pool.stats)
+    return _password_pool
+
+
+def shutdown_password_pool():
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown()
+        _password_pool = None
 
 
 class AuthService:
@@ -45,13 +81,40 @@ class AuthService:
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
+    # bcrypt costs 100–300 ms of CPU per call, so the async paths run it on the
+    # bounded password pool; raises PoolSaturatedError when that pool is full.
+    async def hash_password_async(self, password: str) -> str:
+        started = time.perf_counter()
+        try:
+            return await get_password_pool().run(self.hash_password, password)
+        finally:
+            password_hash_time.observe(time.perf_counter() - started)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        started = time.perf_counter()
+        try:
+            return await get_password_pool().run(self.verify_password, plain_password, hashed_password)
+        finally:
+            password_hash_time.observe(time.perf_counter() - started)
+
     # ── helpers ───────────────────────────────────────────────────
-    def _build_tokens(self, user: User) -> TokenResponse:
-        """Create an access + refresh token pair for *user*."""
+    async def _build_tokens(self, user: User, family_id: Optional[str] = None) -> TokenResponse:
+        """
+        Create an access + refresh token pair for *user*. The refresh token is
+        recorded server-side; both carry the token family so revoking the
+        family invalidates them together.
+        """
         settings = get_settings()
         user_type = user.user_type.value if isinstance(user.user_type, UserType) else str(user.user_type)
-        access = create_access_token(subject=str(user.id), user_type=user_type)
-        refresh = create_refresh_token(subject=str(user.id))
+        jti, family_id, expires_at = await get_token_store().issue(str(user.id), family_id)
+        access = create_access_token(
+            subject=str(user.id),
+            user_type=user_type,
+            extra_claims={**profile_claims(user), "fam": family_id},
+        )
+        refresh = create_refresh_token(
+            subject=str(user.id), jti=jti, family_id=family_id, expires_at=expires_at
+        )
         return TokenResponse(
             access_token=access,
             refresh_token=refresh,
@@ -61,20 +124,13 @@ class AuthService:
 
     @staticmethod
     def _user_to_profile(user: User) -> UserProfile:
-        user_type = user.user_type.value if isinstance(user.user_type, UserType) else str(user.user_type)
-        return UserProfile(
-            id=str(user.id),
-            email=user.email,
-            user_type=user_type,
-            full_name=user.full_name,
-            avatar_url=user.avatar_url,
-            email_confirmed_at=None,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
-        )
+        return user_to_profile(user)
 
     # ── public API ────────────────────────────────────────────────
     async def sign_up(self, request: SignUpRequest) -> AuthResponse:
+        # Hashed before the session opens so no connection is held during bcrypt.
+        password_hash = await self.hash_password_async(request.password)
+
         session_maker = get_session_maker()
         async with session_maker() as session:
             # Check if email already exists
@@ -87,7 +143,7 @@ class AuthService:
 
             user = User(
                 email=request.email,
-                password_hash=self.hash_password(request.password),
+                password_hash=password_hash,
                 full_name=request.full_name,
                 user_type=request.user_type,  # stored as plain string
                 provider="email",
@@ -100,7 +156,7 @@ class AuthService:
             logger.info(f"User signed up: {request.email}, type: {request.user_type}")
             return AuthResponse(
                 user=self._user_to_profile(user),
-                session=self._build_tokens(user),
+                session=await self._build_tokens(user),
             )
 
     async def sign_in(self, request: SignInRequest) -> AuthResponse:
@@ -111,33 +167,45 @@ class AuthService:
             )
             user = result.scalar_one_or_none()
 
-            if user is None:
-                raise ValueError("Invalid email or password")
+        # The session is closed before hashing so a login burst doesn't also
+        # hold database connections while waiting on bcrypt.
+        if user is None:
+            raise ValueError("Invalid email or password")
 
-            if not user.password_hash:
-                raise ValueError("This account uses OAuth login. Please sign in with Google.")
+        if not user.password_hash:
+            raise ValueError("This account uses OAuth login. Please sign in with Google.")
 
-            if not self.verify_password(request.password, user.password_hash):
-                raise ValueError("Invalid email or password")
+        if not await self.verify_password_async(request.password, user.password_hash):
+            raise ValueError("Invalid email or password")
 
-            logger.info(f"User signed in: {request.email}")
-            return AuthResponse(
-                user=self._user_to_profile(user),
-                session=self._build_tokens(user),
-            )
+        logger.info(f"User signed in: {request.email}")
+        return AuthResponse(
+            user=self._user_to_profile(user),
+            session=await self._build_tokens(user),
+        )
 
     async def sign_out(self, access_token: str) -> bool:
         """
-        With stateless JWTs there's nothing to invalidate server-side.
-        The client simply discards the token.
+        Revoke the access token and its refresh-token family, so neither the
+        access token nor any refresh token from this sign-in works again.
         """
-        logger.info("User signed out (client-side token discard)")
+        payload = verify_access_token(access_token)
+        revoke_token(access_token)
+        if payload is not None and payload.get("fam"):
+            await get_token_store().revoke_family(payload["fam"])
+        logger.info("User signed out")
         return True
 
     async def refresh_token(self, token: str) -> TokenResponse:
         payload = verify_refresh_token(token)
         if payload is None:
             raise ValueError("Invalid or expired refresh token")
+        if not payload.get("jti") or not payload.get("fam"):
+            # Minted before server-side rotation existed; cannot be tracked.
+            raise ValueError("Refresh token is no longer valid, please sign in again")
+
+        # Single use: a second exchange of the same token revokes the family.
+        await get_token_store().consume(payload["jti"], payload["fam"])
 
         user_id = payload["sub"]
 
@@ -150,25 +218,13 @@ class AuthService:
             if user is None:
                 raise ValueError("User not found")
 
-            return self._build_tokens(user)
+            return await self._build_tokens(user, family_id=payload["fam"])
 
     async def get_current_user(self, access_token: str) -> Optional[UserProfile]:
         payload = verify_access_token(access_token)
         if payload is None:
             return None
-
-        user_id = payload["sub"]
-
-        session_maker = get_session_maker()
-        async with session_maker() as session:
-            result = await session.execute(
-                select(User).where(User.id == user_id)
-            )
-            user = result.scalar_one_or_none()
-            if user is None:
-                return None
-
-            return self._user_to_profile(user)
+        return await resolve_profile(payload)
 
     async def reset_password(self, email: str, redirect_url: str) -> bool:
         """
@@ -193,6 +249,7 @@ class AuthService:
             raise ValueError("Invalid or expired token")
 
         user_id = payload["sub"]
+        password_hash = await self.hash_password_async(new_password)
 
         session_maker = get_session_maker()
         async with session_maker() as session:
@@ -203,9 +260,12 @@ class AuthService:
             if user is None:
                 raise ValueError("User not found")
 
-            user.password_hash = self.hash_password(new_password)
+            user.password_hash = password_hash
             await session.commit()
             logger.info("Password updated successfully")
+        invalidate_profile(user_id)
+        # Sign out every other session; the one that changed the password stays.
+        await get_token_store().revoke_user(user_id, keep_family_id=payload.get("fam"))
         return True
 
     async def get_google_auth_url(self, user_type: str, redirect_url: str) -> str:
@@ -250,7 +310,7 @@ class AuthService:
             logger.info(f"Google auth successful for: {email}")
             return AuthResponse(
                 user=self._user_to_profile(user),
-                session=self._build_tokens(user),
+                session=await self._build_tokens(user),
             )
 
 
@@ -0,0 +1,191 @@
+"""
+Interview response ingestion and scoring.
+
+A finished interview is submitted as one batch: the answers are validated
+together against the role's question sheet, written with a single
+multi-row INSERT, and the interview's scores are updated in the same
+transaction, so finalizing costs a handful of statements instead of one
+round trip per answer.
+"""
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, update
+
+from app.config.logging import get_logger
+from app.db.session import get_session_maker
+from app.db.models.candidate import Candidate
+from app.db.models.interview import Interview, InterviewQuestion, InterviewResponse, InterviewStatus
+from app.db.models.job_role import JobRole
+from app.db.models.organization import Organization
+from app.db.models.user import UserType
+from app.exceptions.handlers import AppException, ConflictException, ForbiddenException, NotFoundException
+from app.schemas.auth import UserProfile
+from app.schemas.interview import InterviewAnswer, InterviewScoreSummary
+from app.utils import metrics
+
+logger = get_logger("db.services.interview")
+
+ATS_WEIGHT = 0.3
+INTERVIEW_WEIGHT = 0.7
+CLOSED_STATUSES = (InterviewStatus.COMPLETED.value, InterviewStatus.CANCELLED.value)
+
+submit_time = metrics.histogram("interviews.submit_responses.seconds")
+
+
+def interview_score(answers: list[InterviewAnswer], max_scores: dict[str, float]) -> Optional[float]:
+    """
+    Percentage of the role's total attainable score; questions left
+    unanswered count as zero. None if the role has no scorable questions.
+    """
+    attainable = sum(max_scores.values())
+    if attainable <= 0:
+        return None
+    earned = sum(answer.response_score or 0.0 for answer in answers)
+    return round(100.0 * earned / attainable, 2)
+
+
+def final_score(ats_score: Optional[float], interview_score: Optional[float]) -> Optional[float]:
+    """ATS 30% / interview 70%; without an ATS score the interview score stands alone."""
+    if interview_score is None:
+        return None
+    if ats_score is None:
+        return interview_score
+    return round(ATS_WEIGHT * ats_score + INTERVIEW_WEIGHT * interview_score, 2)
+
+
+def _validate(answers: list[InterviewAnswer], max_scores: dict[str, float]) -> None:
+    """Check every answer in one pass and report all problems together."""
+    problems, seen = [], set()
+    for i, answer in enumerate(answers):
+        question_id = str(answer.question_id)
+        if question_id in seen:
+            problems.append(f"responses[{i}]: duplicate answer for question {question_id}")
+        seen.add(question_id)
+        if question_id not in max_scores:
+            problems.append(f"responses[{i}]: question {question_id} is not part of this interview")
+        elif answer.response_score is not None and answer.response_score > max_scores[question_id]:
+            problems.append(
+                f"responses[{i}]: score {answer.response_score} exceeds the question's "
+                f"max score {max_scores[question_id]}"
+            )
+    if problems:
+        raise AppException("; ".join(problems), error_code="INVALID_RESPONSES", status_code=422)
+
+
+class InterviewService:
+    """Writes a whole interview's responses and its scores in one transaction."""
+
+    async def authorize_proctoring(self, interview_id: str, current_user: UserProfile) -> None:
+        """Only the interview's candidate (or an admin) may stream its camera, and only while it is open."""
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            result = await session.execute(
+                select(Interview.status, Candidate.user_id)
+                .join(Candidate, Candidate.id == Interview.candidate_id)
+                .where(Interview.id == interview_id, Interview.is_active == True)  # noqa: E712
+            )
+            row = result.one_or_none()
+        if row is None:
+            raise NotFoundException("Interview not found")
+        status, candidate_user_id = row
+        if current_user.user_type != UserType.ADMIN.value and current_user.id != candidate_user_id:
+            raise ForbiddenException("Only the interview's candidate can stream proctoring frames")
+        if status in CLOSED_STATUSES:
+            raise ConflictException(f"Interview is already {status}")
+
+    async def submit_responses(
+        self,
+        interview_id: str,
+        answers: list[InterviewAnswer],
+        current_user: UserProfile,
+        finalize: bool = True,
+    ) -> InterviewScoreSummary:
+        """
+        Replace the interview's responses with *answers* and, when *finalize*
+        is set, complete it with its interview and final scores.
+        """
+        started = time.perf_counter()
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            # Locks the interview row on PostgreSQL so concurrent submissions serialize.
+            result = await session.execute(
+                select(Interview, Candidate.ats_score, Organization.user_id)
+                .join(Candidate, Candidate.id == Interview.candidate_id)
+                .join(JobRole, JobRole.id == Interview.job_role_id)
+                .join(Organization, Organization.id == JobRole.organization_id)
+                .where(Interview.id == interview_id, Interview.is_active == True)  # noqa: E712
+                .with_for_update(of=Interview)
+            )
+            row = result.one_or_none()
+            if row is None:
+                raise NotFoundException("Interview not found")
+            interview, candidate_ats_score, owner_user_id = row
+
+            if current_user.user_type != UserType.ADMIN.value and current_user.id != owner_user_id:
+                raise ForbiddenException("Only the organization that owns this job role can submit responses")
+            if interview.status in CLOSED_STATUSES:
+                raise ConflictException(f"Interview is already {interview.status}")
+
+            result = await session.execute(
+                select(InterviewQuestion.id, InterviewQuestion.max_score)
+                .where(InterviewQuestion.job_role_id == interview.job_role_id,
+                       InterviewQuestion.is_active == True)  # noqa: E712
+            )
+            max_scores = {question_id: max_score or 0.0 for question_id, max_score in result.all()}
+            _validate(answers, max_scores)
+
+            # A submission carries the whole interview, so it replaces earlier partial saves.
+            await session.execute(delete(InterviewResponse).where(InterviewResponse.interview_id == interview_id))
+            await session.execute(
+                insert(InterviewResponse).values([
+                    {
+                        "id": str(uuid.uuid4()),
+                        "interview_id": interview_id,
+                        "question_id": str(answer.question_id),
+                        "response_text": answer.response_text,
+                        "response_score": answer.response_score,
+                        "confidence_level": answer.confidence_level,
+                        "relevance_score": answer.relevance_score,
+                        "cheating_detected": answer.cheating_detected,
+                        "notes": answer.notes,
+                        "is_active": True,
+                    }
+                    for answer in answers
+                ])
+            )
+
+            now = datetime.now(timezone.utc)
+            values = {"started_at": interview.started_at or now}
+            if finalize:
+                ats_score = interview.ats_score if interview.ats_score is not None else candidate_ats_score
+                score = interview_score(answers, max_scores)
+                values.update(
+                    status=InterviewStatus.COMPLETED.value,
+                    completed_at=now,
+                    ats_score=ats_score,
+                    interview_score=score,
+                    final_score=final_score(ats_score, score),
+                )
+            else:
+                values["status"] = InterviewStatus.IN_PROGRESS.value
+            await session.execute(update(Interview).where(Interview.id == interview_id).values(**values))
+            await session.commit()
+
+        submit_time.observe(time.perf_counter() - started)
+        logger.info(f"Stored {len(answers)} responses for interview {interview_id} (finalize={finalize})")
+        return InterviewScoreSummary(
+            interview_id=interview_id,
+            status=values["status"],
+            responses_saved=len(answers),
+            cheating_flags=sum(1 for answer in answers if answer.cheating_detected),
+            ats_score=values.get("ats_score"),
+            interview_score=values.get("interview_score"),
+            final_score=values.get("final_score"),
+            completed_at=values.get("completed_at"),
+        )
+
+
+interview_service = InterviewService()
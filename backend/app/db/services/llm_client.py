@@ -0,0 +1,247 @@
+"""
+Process-wide async client for the Gemini `generateContent` REST API.
+
+One instance is created in the FastAPI lifespan and shared by every request:
+it keeps a pooled `httpx.AsyncClient`, caps in-flight calls with a semaphore,
+retries 429/5xx responses with jittered exponential backoff and stops calling
+the API for a while once it keeps failing (circuit breaker). Point
+`GEMINI_BASE_URL` at a local fake server to exercise it without quota.
+"""
+import asyncio
+import random
+import time
+from typing import Any, Optional
+
+import httpx
+
+from app.config.settings import get_settings
+from app.config.logging import get_logger
+
+logger = get_logger("db.services.llm_client")
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LLMClientError(Exception):
+    """The LLM call failed and should not be retried by the caller right away."""
+
+
+class CircuitOpenError(LLMClientError):
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"LLM circuit breaker is open, retry in {retry_after:.0f}s")
+
+
+class CircuitBreaker:
+    """
+    Classic closed → open → half-open breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds; the first call afterwards is
+    let through as a probe and closes the breaker again on success.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open":
+            raise CircuitOpenError(self.reset_timeout - (time.monotonic() - self.opened_at))
+        if state == "half_open":
+            if self._probe_in_flight:
+                raise CircuitOpenError(1)
+            self._probe_in_flight = True
+
+    def release_probe(self) -> None:
+        """Give up the half-open probe slot without recording an outcome (e.g. the call was cancelled)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"LLM circuit breaker opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        api_key: Optional[str],
+        model: str,
+        base_url: str,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        timeout: float = 60.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = circuit_breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_concurrency = max_concurrency
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            transport=transport,
+        )
+        self.in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        # "Full jitter": uniform in [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def generate(self, prompt: str) -> str:
+        """Send *prompt* to the model and return the concatenated text parts."""
+        if not self.api_key:
+            raise LLMClientError("API key not found")
+
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        url = f"/v1beta/models/{self.model}:generateContent"
+        self.calls += 1
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self.failures += 1
+                raise
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    self.in_flight += 1
+                    try:
+                        response = await self._client.post(
+                            url, json=payload, headers={"x-goog-api-key": self.api_key}
+                        )
+                    finally:
+                        self.in_flight -= 1
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                error = f"{type(e).__name__}: {e}"
+            except httpx.HTTPError:
+                # Not retryable (e.g. DecodingError, TooManyRedirects), but still a failed call.
+                self.breaker.record_failure()
+                self.failures += 1
+                raise
+            except BaseException:
+                # Cancelled or interrupted before an outcome: free the probe so the breaker can recover.
+                self.breaker.release_probe()
+                raise
+            else:
+                if response.status_code < 400:
+                    self.breaker.record_success()
+                    return self._extract_text(response.json())
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    # Client errors are our fault, not the API's; don't trip the breaker.
+                    self.breaker.record_success()
+                    self.failures += 1
+                    raise LLMClientError(f"LLM request failed with {response.status_code}: {response.text[:200]}")
+                self.breaker.record_failure()
+                retry_after = response.headers.get("Retry-After")
+                error = f"HTTP {response.status_code}"
+
+            if attempt == self.max_retries:
+                break
+            self.retries += 1
+            delay = self._backoff(attempt, retry_after)
+            logger.warning(f"LLM call failed ({error}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        self.failures += 1
+        raise LLMClientError(f"LLM request failed after {self.max_retries + 1} attempts: {error}")
+
+    @staticmethod
+    def _extract_text(data: dict) -> str:
+        candidates = data.get("candidates") or []
+        if not candidates:
+            return ""
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "model": self.model,
+            "max_concurrency": self._max_concurrency,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "circuit_state": self.breaker.state,
+        }
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_llm_client: Optional[GeminiClient] = None
+
+
+def init_llm_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> GeminiClient:
+    global _llm_client
+    if _llm_client is None:
+        settings = get_settings()
+        _llm_client = GeminiClient(
+            api_key=settings.gemini_api_key,
+            model=settings.gemini_model,
+            base_url=settings.gemini_base_url,
+            max_concurrency=settings.llm_max_concurrency,
+            max_retries=settings.llm_max_retries,
+            timeout=settings.llm_timeout_seconds,
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=settings.llm_circuit_failure_threshold,
+                reset_timeout=settings.llm_circuit_reset_seconds,
+            ),
+            transport=transport,
+        )
+        logger.info(f"LLM client initialized for model {settings.gemini_model}")
+    return _llm_client
+
+
+def get_llm_client() -> GeminiClient:
+    return _llm_client if _llm_client is not None else init_llm_client()
+
+
+async def close_llm_client() -> None:
+    global _llm_client
+    if _llm_client is not None:
+        await _llm_client.close()
+        _llm_client = None
+        logger.info("LLM client closed")
@@ -0,0 +1,200 @@
+"""
+Server-side refresh-token store: rotation, reuse detection and revocation.
+
+Every refresh token is a row in `refresh_tokens` (jti, family, expiry).
+Refreshing marks the presented token used and issues the next token in the
+same family; presenting a token that was already used or revoked means it
+leaked, so the whole family is revoked. Revoked families are mirrored into
+an in-memory dict (`app.utils.security`) that token verification checks
+with one lookup, and a background task keeps that dict in sync across
+workers and purges expired rows.
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+
+from app.config.settings import get_settings
+from app.config.logging import get_logger
+from app.db.session import get_session_maker
+from app.db.models.refresh_token import RefreshTokenRecord
+from app.utils import metrics
+from app.utils.security import mark_family_revoked, purge_revoked_families, revoked_family_count
+
+logger = get_logger("db.services.token_store")
+
+
+class RefreshTokenReuseError(ValueError):
+    """An already-rotated refresh token was presented again; its family is now revoked."""
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class RefreshTokenStore:
+    def __init__(self):
+        self.rotations = 0
+        self.reuse_detected = 0
+        self.purged = 0
+
+    async def issue(self, user_id: str, family_id: Optional[str] = None) -> tuple[str, str, datetime]:
+        """Record a new refresh token and return its (jti, family_id, expires_at)."""
+        settings = get_settings()
+        jti = str(uuid.uuid4())
+        family_id = family_id or str(uuid.uuid4())
+        expires_at = datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            session.add(RefreshTokenRecord(
+                jti=jti, family_id=family_id, user_id=str(user_id), expires_at=expires_at,
+            ))
+            await session.commit()
+        return jti, family_id, expires_at
+
+    async def consume(self, jti: str, family_id: str) -> None:
+        """
+        Mark *jti* used so it can be exchanged exactly once. Raises
+        `RefreshTokenReuseError` (after revoking the family) if it was
+        already used or revoked, and `ValueError` if it is unknown or expired.
+        """
+        now = datetime.now(timezone.utc)
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            # A conditional UPDATE is atomic, so two concurrent refreshes with
+            # the same token cannot both succeed.
+            result = await session.execute(
+                update(RefreshTokenRecord)
+                .where(
+                    RefreshTokenRecord.jti == jti,
+                    RefreshTokenRecord.family_id == family_id,
+                    RefreshTokenRecord.used_at.is_(None),
+                    RefreshTokenRecord.revoked_at.is_(None),
+                    RefreshTokenRecord.expires_at > now,
+                )
+                .values(used_at=now)
+            )
+            await session.commit()
+            if result.rowcount == 1:
+                self.rotations += 1
+                return
+
+            record = await session.get(RefreshTokenRecord, jti)
+
+        if record is None or record.family_id != family_id:
+            raise ValueError("Invalid or expired refresh token")
+        if _as_utc(record.expires_at) <= now:
+            raise ValueError("Invalid or expired refresh token")
+
+        self.reuse_detected += 1
+        logger.warning(f"Refresh token reuse detected, revoking family {family_id} (user {record.user_id})")
+        await self.revoke_family(family_id)
+        raise RefreshTokenReuseError("Refresh token reuse detected; please sign in again")
+
+    async def revoke_family(self, family_id: str) -> None:
+        now = datetime.now(timezone.utc)
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            await session.execute(
+                update(RefreshTokenRecord)
+                .where(RefreshTokenRecord.family_id == family_id, RefreshTokenRecord.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+            await session.commit()
+            result = await session.execute(
+                select(func.max(RefreshTokenRecord.expires_at))
+                .where(RefreshTokenRecord.family_id == family_id)
+            )
+            expires_at = result.scalar()
+        # Access tokens expire long before refresh tokens, so keeping the family
+        # until its last refresh token expires covers both.
+        until = _as_utc(expires_at).timestamp() if expires_at is not None else time.time()
+        mark_family_revoked(family_id, until)
+
+    async def revoke_user(self, user_id: str, keep_family_id: Optional[str] = None) -> None:
+        """Revoke every token family of *user_id* except *keep_family_id*, e.g. after a password change."""
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            result = await session.execute(
+                select(RefreshTokenRecord.family_id)
+                .where(RefreshTokenRecord.user_id == str(user_id), RefreshTokenRecord.revoked_at.is_(None))
+                .distinct()
+            )
+            families = [family for family in result.scalars().all() if family != keep_family_id]
+        for family_id in families:
+            await self.revoke_family(family_id)
+
+    async def sync_revoked_families(self) -> None:
+        """Load families revoked by any worker that still have unexpired tokens."""
+        now = datetime.now(timezone.utc)
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            result = await session.execute(
+                select(RefreshTokenRecord.family_id, func.max(RefreshTokenRecord.expires_at))
+                .where(RefreshTokenRecord.revoked_at.is_not(None), RefreshTokenRecord.expires_at > now)
+                .group_by(RefreshTokenRecord.family_id)
+            )
+            rows = result.all()
+        for family_id, expires_at in rows:
+            mark_family_revoked(family_id, _as_utc(expires_at).timestamp())
+
+    async def purge_expired(self) -> int:
+        now = datetime.now(timezone.utc)
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            result = await session.execute(
+                delete(RefreshTokenRecord).where(RefreshTokenRecord.expires_at <= now)
+            )
+            await session.commit()
+        purge_revoked_families()
+        self.purged += result.rowcount or 0
+        return result.rowcount or 0
+
+    def stats(self) -> dict:
+        return {
+            "rotations": self.rotations,
+            "reuse_detected": self.reuse_detected,
+            "purged": self.purged,
+            "revoked_families_in_memory": revoked_family_count(),
+        }
+
+
+_token_store: Optional[RefreshTokenStore] = None
+
+
+def get_token_store() -> RefreshTokenStore:
+    global _token_store
+    if _token_store is None:
+        _token_store = RefreshTokenStore()
+        metrics.register_gauge("auth.refresh_tokens", _token_store.stats)
+    return _token_store
+
+
+async def run_token_maintenance(stop: asyncio.Event) -> None:
+    """
+    Background loop started from the lifespan: re-sync revoked families every
+    `refresh_token_sync_seconds` and purge expired rows every
+    `refresh_token_purge_interval_seconds`, until *stop* is set. Stopping via
+    the event rather than cancellation never interrupts a query mid-flight.
+    """
+    settings = get_settings()
+    store = get_token_store()
+    last_purge: Optional[float] = None
+    while not stop.is_set():
+        try:
+            await store.sync_revoked_families()
+            if last_purge is None or time.monotonic() - last_purge >= settings.refresh_token_purge_interval_seconds:
+                purged = await store.purge_expired()
+                last_purge = time.monotonic()
+                if purged:
+                    logger.info(f"Purged {purged} expired refresh tokens")
+        except Exception as e:
+            logger.warning(f"Refresh token maintenance failed: {e}")
+        try:
+            await asyncio.wait_for(stop.wait(), settings.refresh_token_sync_seconds)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,120 @@
+"""
+Resolve the `UserProfile` behind an access token.
+
+`AUTH_PROFILE_MODE` picks how authenticated requests get the profile:
+
+- ``db``: load the user row on every request (always current, one query each).
+- ``claims``: read it from the profile claims signed into the access token;
+  zero queries, and changes show up when the token is next refreshed.
+- ``cache``: in-process TTL cache keyed by user id, invalidated on password
+  or profile changes; one query per user per TTL per worker.
+
+Tokens without profile claims (minted before ``claims`` mode was enabled)
+fall back to the database.
+"""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import select
+
+from app.config.settings import get_settings
+from app.config.logging import get_logger
+from app.db.session import get_session_maker
+from app.db.models.user import User, UserType
+from app.schemas.auth import UserProfile
+from app.utils import metrics
+from app.utils.cache import TTLCache
+
+logger = get_logger("db.services.user_profiles")
+
+PROFILE_CLAIM = "profile"
+
+
+def user_to_profile(user: User) -> UserProfile:
+    user_type = user.user_type.value if isinstance(user.user_type, UserType) else str(user.user_type)
+    return UserProfile(
+        id=str(user.id),
+        email=user.email,
+        user_type=user_type,
+        full_name=user.full_name,
+        avatar_url=user.avatar_url,
+        email_confirmed_at=None,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def profile_claims(user: User) -> dict[str, Any]:
+    """Extra access-token claims carrying the profile, or {} unless in claims mode."""
+    if get_settings().auth_profile_mode != "claims":
+        return {}
+    return {
+        PROFILE_CLAIM: {
+            "email": user.email,
+            "full_name": user.full_name,
+            "avatar_url": user.avatar_url,
+            "created_at": _isoformat(user.created_at),
+            "updated_at": _isoformat(user.updated_at),
+        }
+    }
+
+
+def _profile_from_claims(payload: dict[str, Any]) -> Optional[UserProfile]:
+    claims = payload.get(PROFILE_CLAIM)
+    if not isinstance(claims, dict):
+        return None
+    return UserProfile(id=payload["sub"], user_type=payload["user_type"], **claims)
+
+
+_profile_cache: Optional[TTLCache] = None
+
+
+def get_profile_cache() -> TTLCache:
+    global _profile_cache
+    if _profile_cache is None:
+        settings = get_settings()
+        _profile_cache = TTLCache(
+            max_entries=settings.auth_profile_cache_max_entries,
+            ttl_seconds=settings.auth_profile_cache_ttl_seconds,
+        )
+        metrics.register_gauge("auth.profile_cache", _profile_cache.stats)
+    return _profile_cache
+
+
+def invalidate_profile(user_id: str) -> None:
+    """Drop a cached profile after the user's password or profile changed."""
+    if _profile_cache is not None:
+        _profile_cache.pop(str(user_id))
+
+
+async def load_profile(user_id: str) -> Optional[UserProfile]:
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        result = await session.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+    return user_to_profile(user) if user is not None else None
+
+
+async def resolve_profile(payload: dict[str, Any]) -> Optional[UserProfile]:
+    """Profile for a verified access-token payload; None if the user no longer exists."""
+    user_id = payload["sub"]
+    mode = get_settings().auth_profile_mode
+
+    if mode == "claims":
+        profile = _profile_from_claims(payload)
+        if profile is not None:
+            return profile
+    elif mode == "cache":
+        cache = get_profile_cache()
+        profile = cache.get(user_id)
+        if profile is None:
+            profile = await load_profile(user_id)
+            if profile is not None:
+                cache.set(user_id, profile)
+        return profile
+
+    return await load_profile(user_id)
@@ -1,9 +1,13 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import AsyncGenerator, Optional
+import time
+import uuid
 
 from app.config.settings import get_settings
 from app.config.logging import get_logger
+from app.utils import metrics
 
 logger = get_logger("db.session")
 
@@ -12,6 +16,38 @@ Base = declarative_base()
 _engine = None
 _async_session_maker = None
 
+# Time spent waiting for a pooled connection; a rising p95 means the pool is too small.
+pool_checkout_wait = metrics.histogram("db.pool.checkout_wait_seconds")
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - started)
+
+
+def pool_stats() -> dict:
+    """Current pool occupancy of the engine, or an empty dict before it exists."""
+    if _engine is None:
+        return {}
+    pool = _engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+    }
+
 
 def get_database_url() -> str:
     """
@@ -40,23 +76,52 @@ def get_database_url() -> str:
     return database_url
 
 
+def _pgbouncer_statement_name() -> str:
+    # Unique names so prepared statements never collide across pgbouncer backends.
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
 def get_engine():
     global _engine
     if _engine is None:
         settings = get_settings()
         database_url = get_database_url()
         
-        # SQLite requires special handling
         connect_args = {}
+        engine_kwargs = {}
         if "sqlite" in database_url:
+            # SQLite requires special handling
             connect_args["check_same_thread"] = False
+        else:
+            engine_kwargs.update(
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout,
+                pool_recycle=settings.db_pool_recycle,
+            )
+            if "asyncpg" in database_url:
+                if settings.db_pgbouncer_mode:
+                    # pgbouncer in transaction mode cannot keep prepared statements
+                    # per connection, so disable both asyncpg caches.
+                    connect_args["statement_cache_size"] = 0
+                    connect_args["prepared_statement_name_func"] = _pgbouncer_statement_name
+                    separator = "&" if "?" in database_url else "?"
+                    database_url = f"{database_url}{separator}prepared_statement_cache_size=0"
+                else:
+                    connect_args["statement_cache_size"] = settings.db_statement_cache_size
+
+        # In-memory SQLite needs its single shared connection, so keep SQLAlchemy's choice there.
+        if ":memory:" not in database_url:
+            engine_kwargs["poolclass"] = InstrumentedQueuePool
         
         _engine = create_async_engine(
             database_url,
             echo=settings.debug,
             pool_pre_ping=True if "sqlite" not in database_url else False,
             connect_args=connect_args,
+            **engine_kwargs,
         )
+        metrics.register_gauge("db.pool", pool_stats)
         # Log only the host portion for security
         if "@" in database_url:
             safe_url = database_url.split("@")[-1]
@@ -95,7 +160,10 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 async def create_tables() -> None:
     """Create all tables in the database from SQLAlchemy models."""
     # Import all models to register them with Base
-    from app.db.models import User, Organization, Candidate, JobRole, Interview, InterviewQuestion, InterviewResponse
+    from app.db.models import (
+        User, Organization, Candidate, JobRole, Interview, InterviewQuestion, InterviewResponse,
+        ATSResultCacheEntry, RefreshTokenRecord,
+    )
 
     logger.info("Creating database tables...")
     try:
@@ -108,7 +176,17 @@ async def create_tables() -> None:
         raise
 
 
-async def init_db(create_tables_on_startup: bool = True) -> None:
+async def init_db(schema_mode: Optional[str] = None) -> None:
+    """
+    Connect and prepare the schema according to ``DB_SCHEMA_MODE``:
+    ``check`` reads the Alembic revision (one query, no table reflection) and
+    raises ``SchemaOutOfDateError`` unless it is the head,
+    ``upgrade`` migrates to head, ``create_all`` is the legacy behaviour and
+    ``off`` skips schema handling entirely.
+    """
+    from app.db.migrate import SchemaOutOfDateError, check_schema, upgrade_schema
+
+    schema_mode = schema_mode or get_settings().db_schema_mode
     logger.info("Initializing database connection...")
     try:
         engine = get_engine()
@@ -116,9 +194,16 @@ async def init_db(create_tables_on_startup: bool = True) -> None:
             pass
         logger.info("Database connection established")
 
-        # Create tables if they don't exist
-        if create_tables_on_startup:
+        if schema_mode == "check":
+            await check_schema()
+        elif schema_mode == "upgrade":
+            await upgrade_schema()
+        elif schema_mode == "create_all":
             await create_tables()
+    except SchemaOutOfDateError as e:
+        # Serving requests against a missing or stale schema only fails later, per request.
+        logger.error(str(e))
+        raise
     except Exception as e:
         logger.warning(f"Database connection failed: {e}")
 
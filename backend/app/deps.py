@@ -5,10 +5,9 @@ from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
 
-from app.db.session import get_session_maker
-from app.db.models.user import User, UserType
+from app.db.models.user import UserType
+from app.db.services.user_profiles import resolve_profile
 from app.utils.security import verify_access_token
 from app.schemas.auth import UserProfile
 from app.config.logging import get_logger
@@ -24,7 +23,7 @@ async def get_current_user(
 ) -> UserProfile:
     """
     FastAPI dependency – extracts and validates the Bearer JWT token,
-    then loads the User from the database.
+    then resolves the user's profile according to AUTH_PROFILE_MODE.
     """
     if credentials is None:
         raise HTTPException(
@@ -41,29 +40,13 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id = payload["sub"]
-
-    session_maker = get_session_maker()
-    async with session_maker() as session:
-        result = await session.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
-
-    if user is None:
+    profile = await resolve_profile(payload)
+    if profile is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-
-    user_type = user.user_type.value if isinstance(user.user_type, UserType) else str(user.user_type)
-    return UserProfile(
-        id=str(user.id),
-        email=user.email,
-        user_type=user_type,
-        full_name=user.full_name,
-        avatar_url=user.avatar_url,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-    )
+    return profile
 
 
 async def get_current_user_optional(
@@ -76,3 +59,15 @@ async def get_current_user_optional(
         return await get_current_user(credentials)
     except HTTPException:
         return None
+
+
+async def get_current_admin(
+    current_user: UserProfile = Depends(get_current_user),
+) -> UserProfile:
+    """Same as get_current_user but only lets admin accounts through."""
+    if current_user.user_type != UserType.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
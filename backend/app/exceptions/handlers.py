@@ -58,7 +58,8 @@ def register_exception_handlers(app: FastAPI) -> None:
             content=ErrorResponse(
                 message=str(exc.detail),
                 error_code="HTTP_ERROR"
-            ).model_dump()
+            ).model_dump(),
+            headers=getattr(exc, "headers", None)
         )
     
     @app.exception_handler(RequestValidationError)
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,8 +6,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.config.settings import get_settings
 from app.config.logging import setup_logging, get_logger
 from app.db.session import init_db, close_db
+from app.db.connection import init_supabase_client, close_async_client
+from app.db.services.ats_service import shutdown_extraction_pool
+from app.db.services.auth_service import shutdown_password_pool
+from app.db.services.token_store import run_token_maintenance
+from app.db.services.llm_client import init_llm_client, close_llm_client
 from app.exceptions.handlers import register_exception_handlers
-from app.routers import health, auth, resume, ats
+from app.proctoring.pool import init_proctoring_pool, shutdown_proctoring_pool
+from app.routers import health, auth, resume, ats, interviews, proctoring
 
 logger = get_logger("main")
 
@@ -17,9 +24,34 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AI Interview Analysis API...")
     
     await init_db()
+    init_llm_client()
+    init_supabase_client()
+    await asyncio.to_thread(resume.init_category_models)
+    await init_proctoring_pool()
+
+    token_maintenance_stop = asyncio.Event()
+    token_maintenance = asyncio.create_task(run_token_maintenance(token_maintenance_stop))
+
+    settings = get_settings()
+    model_watcher = None
+    if settings.resume_model_watch_seconds > 0:
+        model_watcher = asyncio.create_task(
+            resume.watch_category_models(settings.resume_model_watch_seconds)
+        )
     
     yield
     
+    if model_watcher is not None:
+        model_watcher.cancel()
+    # Let token maintenance finish its current query before the engine is disposed.
+    token_maintenance_stop.set()
+    await token_maintenance
+    await resume.close_category_batcher()
+    await shutdown_proctoring_pool()
+    await close_llm_client()
+    await close_async_client()
+    shutdown_extraction_pool()
+    shutdown_password_pool()
     await close_db()
     logger.info("Shutting down AI Interview Analysis API...")
 
@@ -51,6 +83,8 @@ def create_app() -> FastAPI:
     app.include_router(auth.router, prefix="/api/v1")
     app.include_router(resume.router, prefix="/api/v1")
     app.include_router(ats.router, prefix="/api/v1")
+    app.include_router(interviews.router, prefix="/api/v1")
+    app.include_router(proctoring.router, prefix="/api/v1")
     
     @app.get("/", summary="Root endpoint", description="API root with welcome message")
     async def root():
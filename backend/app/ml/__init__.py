@@ -0,0 +1 @@
+# Machine learning model serving
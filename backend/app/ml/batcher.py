@@ -0,0 +1,112 @@
+"""
+Micro-batching front for synchronous model inference.
+
+Concurrent single-item requests are collected for a short window (or until
+the batch is full) and handed to ``predict_fn`` as one list on a dedicated
+worker thread, so vectorized models amortize their per-call overhead and
+the event loop never runs inference itself.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config.logging import get_logger
+from app.utils import metrics
+
+logger = get_logger("ml.batcher")
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        name: str,
+        predict_fn: Callable[[list[Any]], list[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.name = name
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.queue_time = metrics.histogram(f"{name}.queue_seconds")
+        self.batch_size = metrics.histogram(f"{name}.batch_size", BATCH_SIZE_BUCKETS)
+        self.inference_time = metrics.histogram(f"{name}.inference_seconds")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Micro-batcher '{self.name}' started "
+                        f"(max batch {self.max_batch_size}, window {self.max_wait * 1000:.1f} ms)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError(f"Micro-batcher '{self.name}' stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue *item* for the next batch and wait for its individual result."""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list[tuple]:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already waiting before sleeping on the queue.
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - time.perf_counter()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_time.observe(started - enqueued)
+            self.batch_size.observe(len(batch))
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.predict_fn, items)
+            except Exception as e:
+                logger.error(f"Micro-batcher '{self.name}' inference failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self.inference_time.observe(time.perf_counter() - started)
+
+            for (_, future, _), result in zip(batch, results):
+                # The caller may have given up (disconnect/timeout) meanwhile.
+                if not future.done():
+                    future.set_result(result)
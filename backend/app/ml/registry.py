@@ -0,0 +1,177 @@
+"""
+Lazy, versioned registry for the pickled scikit-learn models.
+
+Artifacts are loaded on first use (or eagerly from the lifespan), with
+``joblib``'s ``mmap_mode`` so large numpy arrays are paged in from disk and
+shared between workers through the OS page cache. Every load records a
+version and SHA-256 checksums, and ``reload()`` swaps in a new artifact set
+atomically: requests already holding the previous bundle finish on it,
+the next one sees the new models, and a failed reload keeps the old ones.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from app.config.logging import get_logger
+
+logger = get_logger("ml.registry")
+
+# Optional manifest next to the artifacts, e.g. {"version": "2026-03-17"}.
+MANIFEST_FILENAME = "manifest.json"
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+
+class ModelLoadError(RuntimeError):
+    pass
+
+
+class ModelBundle:
+    """One consistent set of loaded models plus where they came from."""
+
+    def __init__(self, models: dict[str, Any], version: str, checksums: dict[str, str], mtimes: dict[str, float]):
+        self.models = models
+        self.version = version
+        self.checksums = checksums
+        self.mtimes = mtimes
+        self.loaded_at = datetime.now(timezone.utc)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.models[name]
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "checksums": self.checksums,
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, name: str, model_dir: str, artifacts: dict[str, str], mmap_mode: Optional[str] = "r"):
+        self.name = name
+        self.model_dir = model_dir
+        self.artifacts = artifacts
+        self.mmap_mode = mmap_mode
+        self._bundle: Optional[ModelBundle] = None
+        self._lock = threading.Lock()
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+        # Artifact mtimes of the last failed load, so a watcher doesn't retry the same broken files.
+        self._failed_mtimes: Optional[dict[str, float]] = None
+
+    def _paths(self) -> dict[str, str]:
+        return {key: os.path.join(self.model_dir, filename) for key, filename in self.artifacts.items()}
+
+    def _mtimes(self) -> dict[str, float]:
+        return {key: os.path.getmtime(path) for key, path in self._paths().items()}
+
+    def _version(self, checksums: dict[str, str]) -> str:
+        manifest_path = os.path.join(self.model_dir, MANIFEST_FILENAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                version = json.load(f).get("version")
+            if version:
+                return str(version)
+        # No manifest: derive a stable version from the artifact contents.
+        combined = hashlib.sha256("".join(checksums[key] for key in sorted(checksums)).encode())
+        return combined.hexdigest()[:12]
+
+    def _load_bundle(self) -> ModelBundle:
+        # joblib (and sklearn, via unpickling) is imported here so that merely
+        # importing the app does not pay for it.
+        import joblib
+
+        started = time.perf_counter()
+        models, checksums, mtimes = {}, {}, {}
+        try:
+            for key, path in self._paths().items():
+                mtimes[key] = os.path.getmtime(path)
+                checksums[key] = _sha256(path)
+                models[key] = joblib.load(path, mmap_mode=self.mmap_mode)
+        except Exception as e:
+            raise ModelLoadError(f"Failed to load {self.name} models from {self.model_dir}: {e}") from e
+
+        bundle = ModelBundle(models, self._version(checksums), checksums, mtimes)
+        logger.info(f"Loaded {self.name} models version {bundle.version} "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return bundle
+
+    def get(self) -> ModelBundle:
+        """Return the current bundle, loading it on first use."""
+        bundle = self._bundle
+        if bundle is not None:
+            return bundle
+        with self._lock:
+            if self._bundle is None:
+                try:
+                    self._bundle = self._load_bundle()
+                    self.last_error = None
+                except ModelLoadError as e:
+                    self.last_error = str(e)
+                    logger.error(str(e))
+                    raise
+            return self._bundle
+
+    def reload(self) -> ModelBundle:
+        """Load the artifacts again and swap them in; on failure the old bundle stays active."""
+        with self._lock:
+            try:
+                bundle = self._load_bundle()
+            except ModelLoadError as e:
+                self.last_error = str(e)
+                try:
+                    self._failed_mtimes = self._mtimes()
+                except OSError:
+                    self._failed_mtimes = None
+                logger.error(str(e))
+                raise
+            previous = self._bundle
+            self._bundle = bundle
+            self.last_error = None
+            self.reloads += 1
+        if previous is not None and previous.version != bundle.version:
+            logger.info(f"Swapped {self.name} models {previous.version} -> {bundle.version}")
+        return bundle
+
+    def reload_if_changed(self) -> bool:
+        """Reload when any artifact's mtime differs from the loaded bundle's. Returns True on reload."""
+        bundle = self._bundle
+        if bundle is None:
+            return False
+        try:
+            mtimes = self._mtimes()
+        except OSError:
+            # Mid-copy or temporarily missing; look again on the next poll.
+            return False
+        changed = mtimes != bundle.mtimes and mtimes != self._failed_mtimes
+        if changed:
+            self.reload()
+        return changed
+
+    @property
+    def loaded(self) -> bool:
+        return self._bundle is not None
+
+    def info(self) -> dict[str, Any]:
+        bundle = self._bundle
+        return {
+            "name": self.name,
+            "model_dir": self.model_dir,
+            "loaded": bundle is not None,
+            "mmap_mode": self.mmap_mode,
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+            **(bundle.info() if bundle is not None else {}),
+        }
@@ -0,0 +1 @@
+# Server-side proctoring of candidate camera streams
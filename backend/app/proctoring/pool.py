@@ -0,0 +1,495 @@
+"""
+Worker-process pool for analyzing many candidate camera streams at once.
+
+Every stream is pinned to one worker process for its whole life (the least
+loaded one when it opens), because the gaze state of a session lives inside
+that worker's ``GazeAnalyzer``. Workers share nothing, so capacity grows
+with the number of worker processes, i.e. with cores.
+
+Frames never queue up. Each stream has a one-slot mailbox holding only its
+newest frame; a frame that arrives before the previous one was dispatched
+replaces it and counts as dropped. Each worker has one frame in flight and
+next serves the waiting stream it served longest ago, so an overloaded
+worker lowers every stream's analyzed FPS evenly instead of letting lag
+grow without bound.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.exceptions.handlers import ConflictException
+from app.proctoring.worker import worker_main
+from app.utils import metrics
+from app.utils.worker_pool import PoolSaturatedError
+
+logger = get_logger("proctoring.pool")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_ANALYZER_DIR = os.path.join(
+    os.path.dirname(BACKEND_DIR), "video_analysis_for_cheating_detection", "research", "interview-cheat-detection",
+)
+
+# Analyzer results buffered per stream for a client that reads slowly; older ones are dropped.
+EVENT_BUFFER = 8
+# Weight of the newest frame in the smoothed lag.
+LAG_SMOOTHING = 0.2
+# A pool whose workers failed to start is not retried more often than this.
+START_RETRY_SECONDS = 30.0
+STOP_TIMEOUT_SECONDS = 5.0
+
+frame_lag = metrics.histogram("proctoring.frame_lag_seconds")
+analyze_time = metrics.histogram("proctoring.analyze_seconds")
+
+
+class ProctoringUnavailableError(Exception):
+    """Raised when no analyzer worker could be started (missing dlib/OpenCV or predictor file)."""
+
+
+class StreamStats:
+    """Per-stream counters, analyzed FPS over a sliding window and frame lag."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.fps = 0.0
+        self.lag_ms: Optional[float] = None
+        self.avg_lag_ms: Optional[float] = None
+        self.max_lag_ms = 0.0
+        self._window_start = time.monotonic()
+        self._window_frames = 0
+
+    def record(self, lag_seconds: float, now: float) -> None:
+        lag_ms = lag_seconds * 1000.0
+        self.processed += 1
+        self.lag_ms = lag_ms
+        if self.avg_lag_ms is None:
+            self.avg_lag_ms = lag_ms
+        else:
+            self.avg_lag_ms += LAG_SMOOTHING * (lag_ms - self.avg_lag_ms)
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self._window_frames += 1
+        self._roll_window(now)
+
+    def _roll_window(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed >= self.window_seconds:
+            self.fps = self._window_frames / elapsed
+            self._window_start, self._window_frames = now, 0
+
+    def to_dict(self) -> dict[str, Any]:
+        # A stalled stream reports 0 FPS once a full window passes without results.
+        self._roll_window(time.monotonic())
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "fps": round(self.fps, 2),
+            "lag_ms": round(self.lag_ms, 1) if self.lag_ms is not None else None,
+            "avg_lag_ms": round(self.avg_lag_ms, 1) if self.avg_lag_ms is not None else None,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+        }
+
+
+class ProctoringStream:
+    """One candidate's camera stream: its latest-frame mailbox, results and stats."""
+
+    def __init__(self, stream_id: str, worker: "_Worker", window_seconds: float):
+        self.id = stream_id
+        self.worker = worker
+        self.stats = StreamStats(window_seconds)
+        self.opened_at = time.monotonic()
+        self.closed = False
+        self.served_at = 0.0
+        self._pending: Optional[tuple[bytes, float]] = None
+        self._scheduled = False
+        self._events: asyncio.Queue = asyncio.Queue(maxsize=EVENT_BUFFER)
+
+    def offer(self, jpeg: bytes) -> None:
+        """Hand over the newest frame, replacing one that has not been dispatched yet."""
+        if self.closed:
+            return
+        self.stats.received += 1
+        if self._pending is not None:
+            self.stats.dropped += 1
+        self._pending = (jpeg, time.monotonic())
+        if not self._scheduled:
+            self._scheduled = True
+            self.worker.schedule(self)
+
+    def take(self) -> Optional[tuple[bytes, float]]:
+        pending, self._pending = self._pending, None
+        self._scheduled = False
+        self.served_at = time.monotonic()
+        return None if self.closed else pending
+
+    def publish(self, message: dict[str, Any]) -> None:
+        if self._events.full():
+            self._events.get_nowait()
+        self._events.put_nowait(message)
+
+    async def next_message(self) -> dict[str, Any]:
+        """Next analyzer result (or error) for this stream, in frame order."""
+        return await self._events.get()
+
+
+class _Worker:
+    """Parent-side handle of one analyzer process and the streams pinned to it."""
+
+    def __init__(self, index: int, pool: "ProctoringPool"):
+        self.index = index
+        self.pool = pool
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn = None
+        self.available = False
+        self.failed_at: Optional[float] = None
+        self.streams: dict[str, ProctoringStream] = {}
+        self.frames = 0
+        self.busy_seconds = 0.0
+        self._ready: set[ProctoringStream] = set()
+        self._closing: deque[tuple[ProctoringStream, asyncio.Future]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+        # Pipe round trips block, so each worker gets its own thread to wait on.
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"proctoring-{index}")
+
+    def _spawn(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=worker_main,
+            args=(child_conn, self.pool.analyzer_dir, self.pool.predictor_path, self.pool.analyzer_config),
+            name=f"proctoring-worker-{self.index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        if not conn.poll(self.pool.start_timeout):
+            process.kill()
+            conn.close()
+            raise ProctoringUnavailableError(
+                f"worker {self.index} did not start within {self.pool.start_timeout}s"
+            )
+        try:
+            reply = conn.recv()
+        except EOFError:
+            reply = ("failed", f"exit code {process.exitcode}")
+        if reply[0] != "ready":
+            process.join(STOP_TIMEOUT_SECONDS)
+            conn.close()
+            raise ProctoringUnavailableError(f"worker {self.index} failed to start: {reply[1]}")
+        self.process, self.conn = process, conn
+        logger.info(f"Proctoring worker {self.index} started (pid {reply[1]})")
+
+    async def start(self) -> None:
+        """Spawn the process unless it is already running; used for the first start and every restart."""
+        async with self._start_lock:
+            if self.available:
+                return
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._io, self._spawn)
+            except ProctoringUnavailableError:
+                self.failed_at = time.monotonic()
+                raise
+            self.available, self.failed_at = True, None
+            if self._task is None:
+                self._task = asyncio.create_task(self._dispatch())
+
+    @property
+    def restart_due(self) -> bool:
+        return not self.available and (self.failed_at is None or
+                                       time.monotonic() - self.failed_at >= START_RETRY_SECONDS)
+
+    def _roundtrip(self, message: tuple) -> tuple:
+        self.conn.send(message)
+        return self.conn.recv()
+
+    def schedule(self, stream: ProctoringStream) -> None:
+        self._ready.add(stream)
+        self._wakeup.set()
+
+    async def close_stream(self, stream: ProctoringStream) -> Optional[dict[str, Any]]:
+        stream.closed = True
+        if not self.available or self.streams.get(stream.id) is not stream:
+            # Its worker died: the stream was already failed and its analyzer state is gone.
+            return None
+        future = asyncio.get_running_loop().create_future()
+        self._closing.append((stream, future))
+        self._wakeup.set()
+        return await future
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._closing or self._ready:
+                try:
+                    if self._closing:
+                        # Stays queued until answered, so _recover resolves it if the worker dies mid-close.
+                        stream, future = self._closing[0]
+                        _, _, summary = await loop.run_in_executor(self._io, self._roundtrip, ("close", stream.id))
+                        self._closing.popleft()
+                        self.streams.pop(stream.id, None)
+                        if not future.done():
+                            future.set_result(summary)
+                        continue
+
+                    # Least recently served first: streams that send in lockstep still share evenly.
+                    stream = min(self._ready, key=lambda s: s.served_at)
+                    self._ready.discard(stream)
+                    pending = stream.take()
+                    if pending is None:
+                        continue
+                    jpeg, received_at = pending
+                    reply = await loop.run_in_executor(
+                        self._io, self._roundtrip, ("frame", stream.id, received_at - stream.opened_at, jpeg),
+                    )
+                except (EOFError, OSError) as e:
+                    await self._recover(e)
+                    break
+                self._deliver(stream, reply, received_at)
+
+    def _deliver(self, stream: ProctoringStream, reply: tuple, received_at: float) -> None:
+        if reply[0] == "error":
+            stream.stats.errors += 1
+            stream.publish({"type": "error", "message": reply[2], "fatal": False})
+            return
+
+        _, _, event, seconds = reply
+        now = time.monotonic()
+        lag = now - received_at
+        self.frames += 1
+        self.busy_seconds += seconds
+        stream.stats.record(lag, now)
+        frame_lag.observe(lag)
+        analyze_time.observe(seconds)
+        stream.publish({
+            "type": "event",
+            **event,
+            "lag_ms": round(lag * 1000.0, 1),
+            "dropped": stream.stats.dropped,
+        })
+
+    async def _recover(self, error: Exception) -> None:
+        """The process died: fail its streams (their state is gone) and start a fresh one."""
+        logger.error(f"Proctoring worker {self.index} stopped ({type(error).__name__}: {error}); "
+                     f"failing {len(self.streams)} stream(s)")
+        self.available = False
+        for stream in self.streams.values():
+            stream.closed = True
+            stream.publish({"type": "error", "message": "Analyzer worker stopped", "fatal": True})
+            # Frees the interview for a reconnect before the handler gets to close_stream.
+            if self.pool.streams.get(stream.id) is stream:
+                del self.pool.streams[stream.id]
+        self.streams.clear()
+        self._ready.clear()
+        while self._closing:
+            _, future = self._closing.popleft()
+            if not future.done():
+                future.set_result(None)
+        if self.process is not None:
+            self.process.join(0)
+            self.conn.close()
+            self.process, self.conn = None, None
+        try:
+            await self.start()
+        except ProctoringUnavailableError as e:
+            # Retried from ProctoringPool.open_stream once START_RETRY_SECONDS have passed.
+            logger.error(f"Proctoring worker {self.index} could not be restarted: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pid": self.process.pid if self.process is not None else None,
+            "available": self.available,
+            "streams": len(self.streams),
+            "frames": self.frames,
+            "busy_seconds": round(self.busy_seconds, 3),
+        }
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.available = False
+        while self._closing:
+            _, future = self._closing.popleft()
+            if not future.done():
+                future.set_result(None)
+        if self.process is not None:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            await asyncio.get_running_loop().run_in_executor(None, self.process.join, STOP_TIMEOUT_SECONDS)
+            if self.process.is_alive():
+                self.process.kill()
+            self.conn.close()
+            self.process = None
+        self._io.shutdown(wait=False, cancel_futures=True)
+
+
+class ProctoringPool:
+    def __init__(
+        self,
+        workers: int,
+        max_streams_per_worker: int,
+        analyzer_dir: str,
+        predictor_path: Optional[str] = None,
+        analyzer_config: Optional[dict[str, Any]] = None,
+        stats_window_seconds: float = 5.0,
+        start_timeout: float = 60.0,
+        retry_after_seconds: int = 5,
+    ):
+        self.max_streams_per_worker = max_streams_per_worker
+        self.analyzer_dir = analyzer_dir
+        self.predictor_path = predictor_path
+        self.analyzer_config = analyzer_config or {}
+        self.stats_window_seconds = stats_window_seconds
+        self.start_timeout = start_timeout
+        self.retry_after_seconds = retry_after_seconds
+        self.workers = [_Worker(index, self) for index in range(workers)]
+        self.streams: dict[str, ProctoringStream] = {}
+        self.rejected = 0
+        self._started = False
+        self._start_lock = asyncio.Lock()
+        self._start_error: Optional[str] = None
+        self._start_failed_at = 0.0
+
+    async def start(self) -> None:
+        """Spawn every worker (in parallel); idempotent. Fails only if none of them starts."""
+        async with self._start_lock:
+            if self._started:
+                return
+            if self._start_error and time.monotonic() - self._start_failed_at < START_RETRY_SECONDS:
+                raise ProctoringUnavailableError(self._start_error)
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(worker.start() for worker in self.workers), return_exceptions=True)
+            errors = [str(result) for result in results if isinstance(result, Exception)]
+            for error in errors:
+                logger.error(f"Proctoring {error}")
+            if len(errors) == len(self.workers):
+                self._start_error, self._start_failed_at = errors[0], time.monotonic()
+                raise ProctoringUnavailableError(self._start_error)
+
+            self._started, self._start_error = True, None
+            logger.info(f"Proctoring pool started: {len(self.workers) - len(errors)}/{len(self.workers)} workers "
+                        f"in {time.perf_counter() - started:.1f}s")
+
+    async def open_stream(self, stream_id: str) -> ProctoringStream:
+        """Pin a new stream to the least loaded worker."""
+        await self.start()
+        if stream_id in self.streams:
+            raise ConflictException("A proctoring stream is already open for this interview")
+        worker = self._least_loaded()
+        if worker is None or len(worker.streams) >= self.max_streams_per_worker:
+            # Workers that crashed and failed to respawn get another chance, with backoff.
+            await self._restart_failed_workers()
+            worker = self._least_loaded()
+        if worker is None:
+            raise ProctoringUnavailableError("no analyzer worker is running")
+        if len(worker.streams) >= self.max_streams_per_worker:
+            self.rejected += 1
+            raise PoolSaturatedError("proctoring", self.retry_after_seconds)
+
+        stream = ProctoringStream(stream_id, worker, self.stats_window_seconds)
+        worker.streams[stream_id] = stream
+        self.streams[stream_id] = stream
+        logger.info(f"Proctoring stream {stream_id} opened on worker {worker.index}")
+        return stream
+
+    def _least_loaded(self) -> Optional[_Worker]:
+        return min((w for w in self.workers if w.available), key=lambda w: len(w.streams), default=None)
+
+    async def _restart_failed_workers(self) -> None:
+        due = [worker for worker in self.workers if worker.restart_due]
+        if not due:
+            return
+        results = await asyncio.gather(*(worker.start() for worker in due), return_exceptions=True)
+        for worker, result in zip(due, results):
+            if isinstance(result, Exception):
+                logger.error(f"Proctoring worker {worker.index} could not be restarted: {result}")
+            else:
+                logger.info(f"Proctoring worker {worker.index} restarted")
+
+    async def close_stream(self, stream: ProctoringStream) -> Optional[dict[str, Any]]:
+        """Release the stream and return its session summary (None if its worker was lost)."""
+        if self.streams.get(stream.id) is stream:
+            del self.streams[stream.id]
+        return await stream.worker.close_stream(stream)
+
+    def stats(self) -> dict[str, Any]:
+        streams = {stream_id: stream.stats.to_dict() for stream_id, stream in self.streams.items()}
+        return {
+            "workers": [worker.stats() for worker in self.workers],
+            "max_streams_per_worker": self.max_streams_per_worker,
+            "open_streams": len(streams),
+            "rejected": self.rejected,
+            "total_fps": round(sum(s["fps"] for s in streams.values()), 2),
+            "dropped": sum(s["dropped"] for s in streams.values()),
+            "streams": streams,
+        }
+
+    async def shutdown(self) -> None:
+        for stream in self.streams.values():
+            stream.closed = True
+        self.streams.clear()
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
+        self._started = False
+        logger.info("Proctoring pool shut down")
+
+
+_proctoring_pool: Optional[ProctoringPool] = None
+
+
+def get_proctoring_pool() -> ProctoringPool:
+    global _proctoring_pool
+    if _proctoring_pool is None:
+        settings = get_settings()
+        _proctoring_pool = ProctoringPool(
+            workers=settings.proctoring_workers or os.cpu_count() or 1,
+            max_streams_per_worker=settings.proctoring_max_streams_per_worker,
+            analyzer_dir=settings.proctoring_analyzer_dir or DEFAULT_ANALYZER_DIR,
+            predictor_path=settings.proctoring_predictor_path,
+            analyzer_config={
+                "detect_every": settings.proctoring_detect_every,
+                "detection_scale": settings.proctoring_detection_scale,
+            },
+            stats_window_seconds=settings.proctoring_stats_window_seconds,
+            start_timeout=settings.proctoring_start_timeout_seconds,
+            retry_after_seconds=settings.proctoring_retry_after_seconds,
+        )
+        metrics.register_gauge("proctoring.pool", _proctoring_pool.stats)
+    return _proctoring_pool
+
+
+async def init_proctoring_pool() -> None:
+    """Start the workers now when PROCTORING_START_MODE=eager; otherwise on the first stream."""
+    if get_settings().proctoring_start_mode == "eager":
+        try:
+            await get_proctoring_pool().start()
+        except ProctoringUnavailableError:
+            # Already logged; streams are refused until a later start succeeds.
+            pass
+
+
+async def shutdown_proctoring_pool() -> None:
+    global _proctoring_pool
+    if _proctoring_pool is not None:
+        await _proctoring_pool.shutdown()
+        _proctoring_pool = None
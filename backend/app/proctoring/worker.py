@@ -0,0 +1,82 @@
+"""
+Analyzer worker process.
+
+Each worker owns one dlib face detector and landmark predictor and a
+``GazeAnalyzer`` per stream assigned to it, so a stream's gaze history,
+cheat counter and face trackers never leave the process. The parent talks
+to it over a duplex pipe with one request in flight at a time:
+
+    ("frame", stream_id, timestamp, jpeg)  ->  ("event", stream_id, event, seconds)
+    ("close", stream_id)                   ->  ("summary", stream_id, summary)
+    None                                   ->  (process exits)
+
+A frame that cannot be decoded or analyzed answers ``("error", stream_id, message)``.
+On startup the worker sends ``("ready", pid)`` or ``("failed", message)``.
+"""
+import os
+import sys
+import time
+from typing import Any, Optional
+
+
+def _load_analyzer(analyzer_dir: str):
+    # The engine lives with the research scripts, which import each other as flat modules.
+    if analyzer_dir not in sys.path:
+        sys.path.insert(0, analyzer_dir)
+    import gaze_analyzer
+    return gaze_analyzer
+
+
+def worker_main(conn, analyzer_dir: str, predictor_path: Optional[str], config: dict[str, Any]) -> None:
+    try:
+        import cv2
+        import dlib
+        import numpy as np
+
+        # One worker per core: keep OpenCV from spreading each decode over every core.
+        cv2.setNumThreads(1)
+        gaze_analyzer = _load_analyzer(analyzer_dir)
+        predictor_path = predictor_path or os.path.join(analyzer_dir, gaze_analyzer.DEFAULT_PREDICTOR_PATH)
+        detector = dlib.get_frontal_face_detector()
+        predictor = dlib.shape_predictor(predictor_path)
+        gaze_config = gaze_analyzer.GazeConfig(**config)
+    except Exception as e:
+        conn.send(("failed", f"{type(e).__name__}: {e}"))
+        conn.close()
+        return
+
+    analyzers: dict[str, Any] = {}
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+
+        kind, stream_id = message[0], message[1]
+        if kind == "close":
+            analyzer = analyzers.pop(stream_id, None)
+            conn.send(("summary", stream_id, analyzer.summary().to_dict() if analyzer else None))
+            continue
+
+        _, _, timestamp, jpeg = message
+        started = time.perf_counter()
+        try:
+            frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+            if frame is None:
+                raise ValueError("frame is not a decodable image")
+            analyzer = analyzers.get(stream_id)
+            if analyzer is None:
+                analyzer = analyzers[stream_id] = gaze_analyzer.GazeAnalyzer(
+                    gaze_config, detector=detector, predictor=predictor,
+                )
+            event = analyzer.process(frame, timestamp)
+        except Exception as e:
+            conn.send(("error", stream_id, f"{type(e).__name__}: {e}"))
+            continue
+        conn.send(("event", stream_id, event.to_dict(), time.perf_counter() - started))
+
+    conn.close()
@@ -1,29 +1,143 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-import shutil
+from fastapi.responses import StreamingResponse
+import asyncio
+import io
+import json
 import os
-from typing import Optional
+import shutil
+import tempfile
+import zipfile
+from typing import AsyncIterator, Optional, Union
 
-from app.db.services.ats_service import extract_text, get_ats_score
+from sqlalchemy import select
+
+from app.config.settings import get_settings
+from app.db.session import get_session_maker
+from app.db.models.job_role import JobRole
+from app.db.services.ats_prescorer import JobProfile, prescore
+from app.db.services.ats_service import extract_text_async, get_extraction_pool, score_resume
+from app.db.services.ats_cache import get_ats_cache
+from app.db.services.llm_client import get_llm_client
+from app.utils.worker_pool import PoolSaturatedError
 
 router = APIRouter(
     prefix="/ats",
     tags=["ATS Scanner"]
 )
 
-import tempfile
-
+# Only used as a spill area for uploads above `upload_spill_threshold_bytes`.
 UPLOAD_DIR = os.path.join(tempfile.gettempdir(), "ats_uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+UPLOAD_CHUNK_SIZE = 64 * 1024
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+
+
+async def _read_upload(upload: UploadFile, label: str, max_bytes: Optional[int] = None) -> Union[bytes, str]:
+    """
+    Stream an upload into memory, aborting as soon as it exceeds the size limit.
+
+    Returns the raw bytes, or the path of a uniquely named spill file once the
+    upload grows past the spill threshold. The caller owns the spill file.
+    """
+    settings = get_settings()
+    max_bytes = max_bytes or settings.upload_max_bytes
+    chunks: list[bytes] = []
+    size = 0
+    spill = None
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"The {label} exceeds the upload limit of {max_bytes} bytes.",
+                )
+            if spill is None and size > settings.upload_spill_threshold_bytes:
+                os.makedirs(UPLOAD_DIR, exist_ok=True)
+                suffix = os.path.splitext(upload.filename or "")[1]
+                spill = tempfile.NamedTemporaryFile(dir=UPLOAD_DIR, suffix=suffix, delete=False)
+                spill.write(b"".join(chunks))
+                chunks = []
+            if spill is not None:
+                spill.write(chunk)
+            else:
+                chunks.append(chunk)
+    except BaseException:
+        if spill is not None:
+            spill.close()
+            os.remove(spill.name)
+        raise
+
+    if spill is not None:
+        spill.close()
+        return spill.name
+    return b"".join(chunks)
+
+
+async def _extract(source: Union[bytes, str], filename: str, label: str) -> Optional[str]:
+    """Extract text on the worker pool, mapping pool pressure to HTTP errors."""
+    try:
+        return await extract_text_async(source, filename)
+    except PoolSaturatedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Text extraction is busy, please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=400, detail=f"Timed out extracting text from {label}.")
+
+
+async def _read_and_extract(upload: UploadFile, label: str) -> Optional[str]:
+    source = await _read_upload(upload, label)
+    try:
+        return await _extract(source, upload.filename or "", label)
+    finally:
+        if isinstance(source, str):
+            try:
+                os.remove(source)
+            except OSError:
+                pass
+
+
+async def _build_job_profile(job_desc_text: str, job_role_id: Optional[str]) -> JobProfile:
+    """Pre-scorer profile for the JD, enriched with the job role's skills when given."""
+    required_skills, preferred_skills = [], []
+    if job_role_id:
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            result = await session.execute(
+                select(JobRole.required_skills, JobRole.preferred_skills)
+                .where(JobRole.id == job_role_id, JobRole.is_active.is_(True))
+            )
+            row = result.first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Job role not found.")
+        required_skills, preferred_skills = row.required_skills or [], row.preferred_skills or []
+    return JobProfile(job_desc_text, required_skills, preferred_skills)
+
+
+async def _screening_profile(job_desc_text: str, job_role_id: Optional[str]) -> Optional[JobProfile]:
+    """The pre-scorer profile for scoring requests, or None while pre-screening is off."""
+    if get_settings().ats_prescore_threshold <= 0:
+        return None
+    return await _build_job_profile(job_desc_text, job_role_id)
+
 
 @router.post("/evaluate")
 async def evaluate_resume(
     resume_file: UploadFile = File(...),
     job_desc_file: Optional[UploadFile] = File(None),
-    job_desc_text: Optional[str] = Form(None)
+    job_desc_text: Optional[str] = Form(None),
+    job_role_id: Optional[str] = Form(None)
 ):
     """
     Evaluates a resume against a job description using Gemini AI.
-    Provide either a `job_desc_file` or raw `job_desc_text`.
+    Provide either a `job_desc_file` or raw `job_desc_text`. An optional
+    `job_role_id` adds the role's required/preferred skills to the local
+    pre-screen.
     """
     if not job_desc_file and not job_desc_text:
         raise HTTPException(
@@ -31,22 +145,15 @@ async def evaluate_resume(
             detail="You must provide either a job description file or job description text."
         )
 
-    # 1. Save and extract Resume
-    resume_path = os.path.join(UPLOAD_DIR, resume_file.filename)
-    with open(resume_path, "wb") as buffer:
-        shutil.copyfileobj(resume_file.file, buffer)
-    
-    extracted_resume_text = extract_text(resume_path)
+    # 1. Extract Resume
+    extracted_resume_text = await _read_and_extract(resume_file, "resume")
     if not extracted_resume_text:
         raise HTTPException(status_code=400, detail="Failed to extract text from resume.")
 
-    # 2. Save and extract JD
+    # 2. Extract JD
     extracted_jd_text = ""
     if job_desc_file:
-        jd_path = os.path.join(UPLOAD_DIR, job_desc_file.filename)
-        with open(jd_path, "wb") as buffer:
-            shutil.copyfileobj(job_desc_file.file, buffer)
-        extracted_jd_text = extract_text(jd_path)
+        extracted_jd_text = await _read_and_extract(job_desc_file, "job description")
     else:
         extracted_jd_text = job_desc_text
         
@@ -54,17 +161,283 @@ async def evaluate_resume(
          raise HTTPException(status_code=400, detail="Failed to collect job description text.")
 
     # 3. Call Service
-    result = get_ats_score(extracted_resume_text, extracted_jd_text)
-
-    # Cleanup temp files
-    try:
-        os.remove(resume_path)
-        if job_desc_file:
-            os.remove(jd_path)
-    except Exception:
-        pass
+    job_profile = await _screening_profile(extracted_jd_text, job_role_id)
+    result = await score_resume(extracted_resume_text, extracted_jd_text, job_profile)
 
     if isinstance(result, dict) and "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
 
     return result
+
+
+class BatchTooLargeError(Exception):
+    """A batch holds more resumes than ATS_BATCH_MAX_RESUMES."""
+
+
+class ArchiveTooLargeError(Exception):
+    """An archive's resumes unpack to more than ATS_BATCH_MAX_UNCOMPRESSED_BYTES."""
+
+
+def _discard_spilled(items: list[tuple]) -> None:
+    for _, source, _ in items:
+        if isinstance(source, str):
+            try:
+                os.remove(source)
+            except OSError:
+                pass
+
+
+def _unpack_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, spill_threshold: int) -> Union[bytes, str]:
+    """Member bytes, or the path of a spill file for members past the spill threshold (as in `_read_upload`)."""
+    if info.file_size <= spill_threshold:
+        return archive.read(info)
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    suffix = os.path.splitext(info.filename)[1]
+    with archive.open(info) as member, \
+            tempfile.NamedTemporaryFile(dir=UPLOAD_DIR, suffix=suffix, delete=False) as spill:
+        try:
+            shutil.copyfileobj(member, spill, UPLOAD_CHUNK_SIZE)
+        except BaseException:
+            spill.close()
+            os.remove(spill.name)
+            raise
+    return spill.name
+
+
+def _read_zip_members(
+    source: Union[bytes, str],
+    max_member_bytes: int,
+    max_members: int,
+    max_total_bytes: int,
+    spill_threshold: int,
+) -> list[tuple]:
+    """
+    Unpack the supported documents from a zip archive.
+
+    Returns ``(filename, data, error)`` tuples, where data is bytes or a spill
+    file path the caller owns; oversized members are reported individually
+    instead of failing the whole archive. An archive with more than
+    *max_members* documents, or whose documents unpack to more than
+    *max_total_bytes*, is rejected before anything is read.
+    """
+    members = []
+    archive = zipfile.ZipFile(source if isinstance(source, str) else io.BytesIO(source))
+    with archive:
+        documents = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not os.path.basename(info.filename).startswith(".")
+            and "__MACOSX" not in info.filename
+            and info.filename.lower().endswith(SUPPORTED_EXTENSIONS)
+        ]
+        if len(documents) > max_members:
+            raise BatchTooLargeError()
+        # zipfile never yields more than a member's declared size, so this bounds what is unpacked.
+        if sum(info.file_size for info in documents if info.file_size <= max_member_bytes) > max_total_bytes:
+            raise ArchiveTooLargeError()
+        try:
+            for info in documents:
+                name = info.filename
+                if info.file_size > max_member_bytes:
+                    members.append((name, None, f"File exceeds the upload limit of {max_member_bytes} bytes."))
+                    continue
+                members.append((name, _unpack_member(archive, info, spill_threshold), None))
+        except BaseException:
+            _discard_spilled(members)
+            raise
+    return members
+
+
+async def _extract_with_retry(source: Union[bytes, str], filename: str, attempts: int = 3) -> Optional[str]:
+    """Batch items wait out a saturated pool instead of failing straight away."""
+    for attempt in range(attempts):
+        try:
+            return await extract_text_async(source, filename)
+        except PoolSaturatedError as e:
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(e.retry_after)
+
+
+@router.post("/prescore")
+async def prescore_resume(
+    resume_file: UploadFile = File(...),
+    job_desc_file: Optional[UploadFile] = File(None),
+    job_desc_text: Optional[str] = Form(None),
+    job_role_id: Optional[str] = Form(None)
+):
+    """
+    Runs only the local keyword pre-screen (no LLM call) and reports whether
+    the resume would be forwarded for a full evaluation.
+    """
+    if not job_desc_file and not job_desc_text:
+        raise HTTPException(
+            status_code=400,
+            detail="You must provide either a job description file or job description text."
+        )
+    resume_text = await _read_and_extract(resume_file, "resume")
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="Failed to extract text from resume.")
+    jd_text = await _read_and_extract(job_desc_file, "job description") if job_desc_file else job_desc_text
+    if not jd_text:
+        raise HTTPException(status_code=400, detail="Failed to collect job description text.")
+
+    threshold = get_settings().ats_prescore_threshold
+    result = prescore(resume_text, await _build_job_profile(jd_text, job_role_id))
+    return {**result.to_dict(), "threshold": threshold, "forwarded_to_llm": result.score >= threshold}
+
+
+@router.post("/evaluate/batch")
+async def evaluate_resume_batch(
+    resume_files: list[UploadFile] = File(default=[]),
+    resume_zip: Optional[UploadFile] = File(None),
+    job_desc_file: Optional[UploadFile] = File(None),
+    job_desc_text: Optional[str] = Form(None),
+    job_role_id: Optional[str] = Form(None)
+):
+    """
+    Evaluates many resumes against one job description.
+
+    Upload the resumes as repeated `resume_files` parts and/or a `resume_zip`
+    archive. The job description is extracted once, resumes are extracted and
+    scored concurrently, and results are streamed back as NDJSON in completion
+    order — one line per resume, followed by a final summary line. A failed
+    resume produces an error line and does not abort the batch.
+    """
+    settings = get_settings()
+    if not resume_files and not resume_zip:
+        raise HTTPException(status_code=400, detail="You must provide resume files or a zip archive of resumes.")
+    if not job_desc_file and not job_desc_text:
+        raise HTTPException(
+            status_code=400,
+            detail="You must provide either a job description file or job description text."
+        )
+
+    # 1. Extract the JD once for the whole batch
+    if job_desc_file:
+        extracted_jd_text = await _read_and_extract(job_desc_file, "job description")
+    else:
+        extracted_jd_text = job_desc_text
+    if not extracted_jd_text:
+        raise HTTPException(status_code=400, detail="Failed to collect job description text.")
+    job_profile = await _screening_profile(extracted_jd_text, job_role_id)
+
+    # 2. Read every upload before streaming starts; the request body is gone afterwards.
+    items: list[tuple] = []
+    for upload in resume_files:
+        try:
+            items.append((upload.filename, await _read_upload(upload, "resume"), None))
+        except HTTPException as e:
+            items.append((upload.filename, None, str(e.detail)))
+    too_large = HTTPException(
+        status_code=400,
+        detail=f"A batch may contain at most {settings.ats_batch_max_resumes} resumes."
+    )
+    if resume_zip:
+        archive = await _read_upload(resume_zip, "resume archive", settings.ats_batch_max_archive_bytes)
+        try:
+            items.extend(await asyncio.to_thread(
+                _read_zip_members,
+                archive,
+                settings.upload_max_bytes,
+                max(0, settings.ats_batch_max_resumes - len(items)),
+                settings.ats_batch_max_uncompressed_bytes,
+                settings.upload_spill_threshold_bytes,
+            ))
+        except zipfile.BadZipFile:
+            _discard_spilled(items)
+            raise HTTPException(status_code=400, detail="The resume archive is not a valid zip file.")
+        except BatchTooLargeError:
+            _discard_spilled(items)
+            raise too_large
+        except ArchiveTooLargeError:
+            _discard_spilled(items)
+            raise HTTPException(
+                status_code=413,
+                detail=f"The resume archive unpacks to more than {settings.ats_batch_max_uncompressed_bytes} bytes.",
+            )
+        finally:
+            if isinstance(archive, str):
+                os.remove(archive)
+    if len(items) > settings.ats_batch_max_resumes:
+        _discard_spilled(items)
+        raise too_large
+
+    return StreamingResponse(
+        _stream_batch_results(items, extracted_jd_text, job_profile),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_batch_results(
+    items: list[tuple], jd_text: str, job_profile: Optional[JobProfile],
+) -> AsyncIterator[str]:
+    settings = get_settings()
+    # Leave one extraction worker free for single-resume requests.
+    extract_slots = asyncio.Semaphore(max(1, settings.extraction_max_workers - 1))
+    score_slots = asyncio.Semaphore(max(1, settings.ats_batch_concurrency))
+
+    async def evaluate(index: int, filename: str, source, error: Optional[str]) -> dict:
+        line = {"index": index, "filename": filename}
+        try:
+            if error:
+                return {**line, "status": "error", "error": error}
+            async with extract_slots:
+                try:
+                    resume_text = await _extract_with_retry(source, filename)
+                except PoolSaturatedError:
+                    return {**line, "status": "error", "error": "Text extraction is busy, please retry."}
+                except asyncio.TimeoutError:
+                    return {**line, "status": "error", "error": "Timed out extracting text from resume."}
+            if not resume_text:
+                return {**line, "status": "error", "error": "Failed to extract text from resume."}
+            async with score_slots:
+                result = await score_resume(resume_text, jd_text, job_profile)
+            if isinstance(result, dict) and "error" in result:
+                return {**line, "status": "error", "error": result["error"]}
+            return {**line, "status": "ok", "result": result}
+        except Exception as e:
+            return {**line, "status": "error", "error": f"Unexpected error: {e}"}
+        finally:
+            if isinstance(source, str):
+                try:
+                    os.remove(source)
+                except OSError:
+                    pass
+
+    tasks = [asyncio.create_task(evaluate(i, *item)) for i, item in enumerate(items)]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            if line["status"] == "ok":
+                succeeded += 1
+            yield json.dumps(line) + "\n"
+        yield json.dumps({
+            "summary": {"total": len(items), "succeeded": succeeded, "failed": len(items) - succeeded}
+        }) + "\n"
+    finally:
+        # The client may disconnect mid-stream; don't leave orphaned work behind.
+        for task in tasks:
+            task.cancel()
+        for _, source, _ in items:
+            if isinstance(source, str) and os.path.exists(source):
+                os.remove(source)
+
+
+@router.get("/cache/stats")
+async def ats_cache_stats():
+    """Hit/miss counters for the ATS result cache of this worker."""
+    return get_ats_cache().stats()
+
+
+@router.get("/extraction/stats")
+async def extraction_pool_stats():
+    """Queue depth and outcome counters for the text extraction pool of this worker."""
+    return get_extraction_pool().stats()
+
+
+@router.get("/llm/stats")
+async def llm_client_stats():
+    """In-flight calls, retries and circuit breaker state of the shared LLM client."""
+    return get_llm_client().stats()
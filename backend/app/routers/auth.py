@@ -12,12 +12,21 @@ from app.schemas.responses import ApiResponse
 from app.config.settings import get_settings
 from app.config.logging import get_logger
 from app.utils.security import verify_access_token
+from app.utils.worker_pool import PoolSaturatedError
 from fastapi.security import HTTPAuthorizationCredentials
 
 logger = get_logger("routers.auth")
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _password_pool_busy(e: PoolSaturatedError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many concurrent password operations, please retry shortly.",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 @router.post(
     "/signup",
     response_model=AuthResponse,
@@ -27,6 +36,8 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 async def signup(request: SignUpRequest) -> AuthResponse:
     try:
         return await auth_service.sign_up(request)
+    except PoolSaturatedError as e:
+        raise _password_pool_busy(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -43,6 +54,8 @@ async def signup(request: SignUpRequest) -> AuthResponse:
 async def signin(request: SignInRequest) -> AuthResponse:
     try:
         return await auth_service.sign_in(request)
+    except PoolSaturatedError as e:
+        raise _password_pool_busy(e)
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
     except Exception as e:
@@ -169,6 +182,8 @@ async def update_password(
     try:
         await auth_service.update_password(credentials.credentials, body.password)
         return ApiResponse(success=True, message="Password updated successfully")
+    except PoolSaturatedError as e:
+        raise _password_pool_busy(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -2,8 +2,9 @@ from fastapi import APIRouter
 from sqlalchemy import text
 
 from app.config.settings import get_settings
-from app.db.session import get_engine
+from app.db.session import get_engine, pool_checkout_wait, pool_stats
 from app.schemas.responses import HealthResponse
+from app.utils import metrics
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -33,5 +34,22 @@ async def health_check() -> HealthResponse:
     )
 
 
+@router.get(
+    "/metrics",
+    summary="In-process metrics",
+    description="Histograms and gauges recorded by this worker process (latencies, batch sizes, pool usage)."
+)
+async def metrics_snapshot() -> dict:
+    return metrics.snapshot()
 
 
+@router.get(
+    "/db-pool",
+    summary="Database connection pool",
+    description="Pool occupancy and connection checkout wait times for this worker."
+)
+async def db_pool_status() -> dict:
+    return {
+        **pool_stats(),
+        "checkout_wait_seconds": pool_checkout_wait.snapshot(),
+    }
@@ -0,0 +1,32 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+
+from app.db.services.interview_service import interview_service
+from app.deps import get_current_user
+from app.schemas.auth import UserProfile
+from app.schemas.interview import InterviewResponsesSubmit, InterviewScoreSummary
+from app.config.logging import get_logger
+
+logger = get_logger("routers.interviews")
+router = APIRouter(prefix="/interviews", tags=["Interviews"])
+
+
+@router.post(
+    "/{interview_id}/responses",
+    response_model=InterviewScoreSummary,
+    summary="Submit interview responses",
+    description=(
+        "Store every answer of an interview in one transaction and, unless `finalize` is false, "
+        "complete it with its interview score and final score (ATS 30% / interview 70%). "
+        "Resubmitting replaces the previous responses until the interview is completed."
+    ),
+)
+async def submit_responses(
+    interview_id: UUID,
+    request: InterviewResponsesSubmit,
+    current_user: UserProfile = Depends(get_current_user),
+) -> InterviewScoreSummary:
+    return await interview_service.submit_responses(
+        str(interview_id), request.responses, current_user, finalize=request.finalize,
+    )
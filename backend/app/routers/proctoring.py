@@ -0,0 +1,111 @@
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+
+from app.config.settings import get_settings
+from app.db.services.interview_service import interview_service
+from app.db.services.user_profiles import resolve_profile
+from app.deps import get_current_admin
+from app.exceptions.handlers import AppException
+from app.proctoring.pool import ProctoringStream, ProctoringUnavailableError, get_proctoring_pool
+from app.schemas.auth import UserProfile
+from app.utils.security import verify_access_token
+from app.utils.worker_pool import PoolSaturatedError
+from app.config.logging import get_logger
+
+logger = get_logger("routers.proctoring")
+router = APIRouter(prefix="/proctoring", tags=["Proctoring"])
+
+# Client text message asking for the session summary before the socket closes.
+END_MESSAGE = "end"
+
+
+async def _authenticate(token: Optional[str]) -> Optional[UserProfile]:
+    # Browsers cannot set headers on a WebSocket handshake, so the access token comes as ?token=.
+    payload = verify_access_token(token) if token else None
+    return await resolve_profile(payload) if payload else None
+
+
+async def _send_results(websocket: WebSocket, stream: ProctoringStream) -> None:
+    """Forward analyzer results to the client; a fatal error (lost worker) ends the session."""
+    try:
+        while True:
+            message = await stream.next_message()
+            await websocket.send_json(message)
+            if message.get("fatal"):
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason=message["message"])
+                return
+    except (WebSocketDisconnect, RuntimeError):
+        # Client went away while a result was being sent.
+        return
+
+
+@router.websocket("/interviews/{interview_id}/stream")
+async def proctoring_stream(websocket: WebSocket, interview_id: UUID, token: Optional[str] = None):
+    """
+    Stream a candidate's camera for live gaze analysis.
+
+    Send each camera frame as one binary JPEG message. Every analyzed frame is
+    answered with a JSON `event` (gaze, cheat counter, `lag_ms`, `dropped`);
+    frames arriving faster than the analyzer keeps up are dropped, newest wins.
+    Send the text message `end` to receive the session `summary` and close.
+    """
+    await websocket.accept()
+    profile = await _authenticate(token)
+    if profile is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid or expired token")
+        return
+
+    pool = get_proctoring_pool()
+    try:
+        await interview_service.authorize_proctoring(str(interview_id), profile)
+        stream = await pool.open_stream(str(interview_id))
+    except AppException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.message)
+        return
+    except PoolSaturatedError as e:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER,
+                              reason=f"Proctoring is at capacity, retry in {e.retry_after}s")
+        return
+    except ProctoringUnavailableError as e:
+        logger.error(f"Proctoring unavailable: {e}")
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="Proctoring is unavailable")
+        return
+
+    max_frame_bytes = get_settings().proctoring_max_frame_bytes
+    sender = asyncio.create_task(_send_results(websocket, stream))
+    summary_requested = False
+    try:
+        while not sender.done():
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            frame = message.get("bytes")
+            if frame is not None:
+                if len(frame) > max_frame_bytes:
+                    await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG,
+                                          reason=f"Frames are limited to {max_frame_bytes} bytes")
+                    break
+                stream.offer(frame)
+            elif message.get("text") == END_MESSAGE:
+                summary_requested = True
+                break
+    finally:
+        sender.cancel()
+        summary = await pool.close_stream(stream)
+        logger.info(f"Proctoring stream {interview_id} closed: {stream.stats.to_dict()} summary={summary}")
+
+    if summary_requested:
+        await websocket.send_json({"type": "summary", "summary": summary, "stats": stream.stats.to_dict()})
+        await websocket.close()
+
+
+@router.get(
+    "/streams",
+    summary="Proctoring streams",
+    description="Worker processes and per-stream FPS, lag and dropped frames on this API process.",
+)
+async def proctoring_streams(_: UserProfile = Depends(get_current_admin)) -> dict:
+    return get_proctoring_pool().stats()
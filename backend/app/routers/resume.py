@@ -1,24 +1,32 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-import joblib
-import re
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import Optional
+import asyncio
+import numpy as np
 import os
 
+from app.config.settings import get_settings
+from app.config.logging import get_logger
+from app.deps import get_current_admin
+from app.ml.batcher import MicroBatcher
+from app.ml.registry import ModelLoadError, ModelRegistry
+from app.utils.text_cleaning import clean_resume_text
+
 router = APIRouter(
     prefix="/resume",
     tags=["Resume Analysis"]
 )
 
+logger = get_logger("routers.resume")
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 models_dir = os.path.join(BASE_DIR, "machine_learning", "saved_models")
 
-try:
-    vectorizer = joblib.load(os.path.join(models_dir, "tfidf_vectorizer_categorization.pkl"))
-    gb_classifier = joblib.load(os.path.join(models_dir, "gb_classifier_categorization.pkl"))
-except Exception as e:
-    vectorizer = None
-    gb_classifier = None
-    print(f"Failed to load resume categorization models: {e}")
+CATEGORY_MODEL_ARTIFACTS = {
+    "vectorizer": "tfidf_vectorizer_categorization.pkl",
+    "classifier": "gb_classifier_categorization.pkl",
+}
 
 CATEGORIES = [
     'ACCOUNTANT', 'ADVOCATE', 'AGRICULTURE', 'APPAREL', 'ARTS', 'AUTOMOBILE', 
@@ -27,25 +35,8 @@ CATEGORIES = [
     'HEALTHCARE', 'HR', 'INFORMATION-TECHNOLOGY', 'PUBLIC-RELATIONS', 'SALES', 'TEACHER'
 ]
 
-# Regex patterns for cleaning
-url_pattern = re.compile(r'http\S*')
-rt_cc_pattern = re.compile(r'\b(RT|cc)\b')
-hashtag_pattern = re.compile(r'#\S*')
-mention_pattern = re.compile(r'@\S+')
-special_chars_pattern = re.compile(r'[%s]' % re.escape(r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""))
-non_ascii_pattern = re.compile(r'[^\x00-\x7f]')
-extra_spaces_pattern = re.compile(r'\s+')
-
-def cleanResume(txt: str) -> str:
-    txt = txt.lower()
-    txt = url_pattern.sub(' ', txt)
-    txt = rt_cc_pattern.sub(' ', txt)
-    txt = hashtag_pattern.sub(' ', txt)
-    txt = mention_pattern.sub(' ', txt)
-    txt = special_chars_pattern.sub(' ', txt)
-    txt = non_ascii_pattern.sub(' ', txt)
-    txt = extra_spaces_pattern.sub(' ', txt).strip()
-    return txt
+# Single-pass cleaner, identical in output to the original seven-regex chain.
+cleanResume = clean_resume_text
 
 class ResumeTextRequest(BaseModel):
     text: str
@@ -53,20 +44,194 @@ class ResumeTextRequest(BaseModel):
 class ResumePredictionResponse(BaseModel):
     category: str
 
+class ResumeBatchRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1, description="Raw resume texts to categorize")
+    top_k: int = Field(default=3, ge=1, le=len(CATEGORIES), description="Number of most likely categories to return")
+
+class CategoryProbability(BaseModel):
+    category: str
+    probability: float
+
+class ResumeBatchPrediction(BaseModel):
+    category: Optional[str] = None
+    probabilities: list[CategoryProbability] = Field(default_factory=list)
+    error: Optional[str] = None
+
+class ResumeBatchResponse(BaseModel):
+    predictions: list[ResumeBatchPrediction]
+
+
+_category_models: Optional[ModelRegistry] = None
+
+
+def get_category_models() -> ModelRegistry:
+    global _category_models
+    if _category_models is None:
+        settings = get_settings()
+        _category_models = ModelRegistry(
+            "resume_categorizer",
+            settings.resume_model_dir or models_dir,
+            CATEGORY_MODEL_ARTIFACTS,
+            mmap_mode="r" if settings.resume_model_mmap else None,
+        )
+    return _category_models
+
+
+def init_category_models() -> None:
+    """Load the models now when RESUME_MODEL_LOAD_MODE=eager; otherwise they load on first request."""
+    if get_settings().resume_model_load_mode == "eager":
+        try:
+            get_category_models().get()
+        except ModelLoadError:
+            # Already logged; the endpoints answer 500 until a reload succeeds.
+            pass
+
+
+async def watch_category_models(interval: float) -> None:
+    """Poll the artifacts' mtimes and hot-reload them when they change."""
+    registry = get_category_models()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(registry.reload_if_changed)
+        except ModelLoadError:
+            pass
+
+
+def _load_models():
+    try:
+        return get_category_models().get()
+    except ModelLoadError:
+        raise HTTPException(status_code=500, detail="Models not loaded")
+
+
+def _class_label(class_value) -> str:
+    index = int(class_value)
+    return CATEGORIES[index] if 0 <= index < len(CATEGORIES) else "UNKNOWN"
+
+
+def _predict_categories(texts: list[str]) -> list[Optional[str]]:
+    """Batch worker for the micro-batcher: clean, vectorize and classify in one go."""
+    models = get_category_models().get()
+    cleaned = [cleanResume(text) for text in texts]
+    rows = [i for i, text in enumerate(cleaned) if text]
+    categories: list[Optional[str]] = [None] * len(texts)
+    if rows:
+        tfidf_features = models["vectorizer"].transform([cleaned[i] for i in rows])
+        for i, prediction in zip(rows, models["classifier"].predict(tfidf_features)):
+            categories[i] = _class_label(prediction)
+    return categories
+
+
+_category_batcher: Optional[MicroBatcher] = None
+
+
+def get_category_batcher() -> MicroBatcher:
+    global _category_batcher
+    if _category_batcher is None:
+        settings = get_settings()
+        _category_batcher = MicroBatcher(
+            "resume_categorizer",
+            _predict_categories,
+            max_batch_size=settings.resume_batch_max_size,
+            max_wait_ms=settings.resume_batch_window_ms,
+        )
+    return _category_batcher
+
+
+async def close_category_batcher() -> None:
+    global _category_batcher
+    if _category_batcher is not None:
+        await _category_batcher.stop()
+        _category_batcher = None
+
+
 @router.post("/predict-category", response_model=ResumePredictionResponse)
 async def predict_resume_category(request: ResumeTextRequest):
-    if vectorizer is None or gb_classifier is None:
-        raise HTTPException(status_code=500, detail="Models not loaded")
-    
-    clean_text = cleanResume(request.text)
-    if not clean_text:
+    # Lazy first load happens off the event loop.
+    await run_in_threadpool(_load_models)
+
+    try:
+        # Concurrent requests are coalesced into one batched predict off the event loop.
+        category = await get_category_batcher().submit(request.text)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+    if category is None:
         raise HTTPException(status_code=400, detail="Resume text is empty after cleaning")
-        
+    return {"category": category}
+
+
+def _predict_batch(texts: list[str], top_k: int) -> list[ResumeBatchPrediction]:
+    """Clean every text, then run one sparse transform and one predict_proba for the whole batch."""
+    # One bundle for the whole batch, even if a reload swaps models meanwhile.
+    models = get_category_models().get()
+    vectorizer, gb_classifier = models["vectorizer"], models["classifier"]
+    cleaned = [cleanResume(text) for text in texts]
+    rows = [i for i, text in enumerate(cleaned) if text]
+    predictions = [
+        ResumeBatchPrediction(error="Resume text is empty after cleaning") for _ in texts
+    ]
+    if not rows:
+        return predictions
+
+    tfidf_features = vectorizer.transform([cleaned[i] for i in rows])
+    probabilities = gb_classifier.predict_proba(tfidf_features)
+    labels = [_class_label(c) for c in gb_classifier.classes_]
+    k = min(top_k, probabilities.shape[1])
+    # argpartition finds the top-k per row in O(n_classes); only those k are sorted.
+    top = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(probabilities, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    for row, text_index in enumerate(rows):
+        ranked = [
+            CategoryProbability(category=labels[c], probability=round(float(p), 6))
+            for c, p in zip(top[row], top_scores[row])
+        ]
+        predictions[text_index] = ResumeBatchPrediction(category=ranked[0].category, probabilities=ranked)
+    return predictions
+
+
+@router.post("/predict-category/batch", response_model=ResumeBatchResponse)
+async def predict_resume_category_batch(request: ResumeBatchRequest):
+    """
+    Categorizes many resumes in one call. Texts are vectorized together and
+    scored with a single `predict_proba`, so bulk back-fills run at matrix
+    speed. Each prediction carries the top-k categories with probabilities;
+    texts that are empty after cleaning get an `error` instead.
+    """
+    await run_in_threadpool(_load_models)
+
+    max_texts = get_settings().resume_batch_max_texts
+    if len(request.texts) > max_texts:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {max_texts} texts.")
+
     try:
-        tfidf_features = vectorizer.transform([clean_text])
-        prediction = gb_classifier.predict(tfidf_features)[0]
-        
-        category = CATEGORIES[int(prediction)] if 0 <= int(prediction) < len(CATEGORIES) else "UNKNOWN"
-        return {"category": category}
+        predictions = await run_in_threadpool(_predict_batch, request.texts, request.top_k)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+    return ResumeBatchResponse(predictions=predictions)
+
+
+@router.get("/models", summary="Resume categorizer model info")
+async def resume_model_info():
+    """Version, checksums and load state of the categorization models in this worker."""
+    return get_category_models().info()
+
+
+@router.post("/models/reload", summary="Hot-reload the resume categorizer models")
+async def reload_resume_models(admin=Depends(get_current_admin)):
+    """
+    Re-reads the artifacts from disk and swaps them in without a restart.
+    Applies to the worker that serves the request; set
+    `RESUME_MODEL_WATCH_SECONDS` to have every worker pick up new files.
+    """
+    try:
+        await run_in_threadpool(get_category_models().reload)
+    except ModelLoadError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"Resume models reloaded by {admin.email}")
+    return get_category_models().info()
@@ -73,3 +73,25 @@ class InterviewResponseCreate(InterviewResponseBase):
 class InterviewResponseDetail(InterviewResponseBase, IdMixin, TimestampMixin):
     interview_id: UUID
     question_id: UUID
+
+
+class InterviewAnswer(InterviewResponseBase):
+    question_id: UUID = Field(..., description="Question ID")
+
+
+class InterviewResponsesSubmit(AppBaseModel):
+    responses: list[InterviewAnswer] = Field(
+        ..., min_length=1, max_length=500, description="Every answer of the interview, one per question"
+    )
+    finalize: bool = Field(default=True, description="Mark the interview completed and compute its scores")
+
+
+class InterviewScoreSummary(AppBaseModel):
+    interview_id: UUID
+    status: str
+    responses_saved: int = Field(..., description="Number of responses written")
+    cheating_flags: int = Field(default=0, description="Responses flagged for cheating")
+    ats_score: Optional[float] = Field(default=None, description="ATS score (30% weight)")
+    interview_score: Optional[float] = Field(default=None, description="Interview score (70% weight)")
+    final_score: Optional[float] = Field(default=None, description="Final combined score")
+    completed_at: Optional[datetime] = None
@@ -0,0 +1,99 @@
+"""
+Minimal in-process metrics registry.
+
+Components register histograms or gauge callbacks by name; the health
+router exposes a snapshot of everything registered in this worker.
+"""
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Optional, Sequence
+
+# Seconds, from sub-millisecond up to a minute.
+DEFAULT_TIME_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style upper bounds."""
+
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_TIME_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def _quantile(self, q: float, counts: list[int], total: int) -> Optional[float]:
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total, value_sum = self._count, self._sum
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = total
+        return {
+            "count": total,
+            "sum": round(value_sum, 6),
+            "mean": round(value_sum / total, 6) if total else None,
+            # Upper bucket bounds, i.e. conservative estimates.
+            "p50": self._quantile(0.5, counts, total),
+            "p95": self._quantile(0.95, counts, total),
+            "p99": self._quantile(0.99, counts, total),
+            "buckets": buckets,
+        }
+
+
+_lock = threading.Lock()
+_histograms: dict[str, Histogram] = {}
+_gauges: dict[str, Callable[[], Any]] = {}
+
+
+def histogram(name: str, buckets: Sequence[float] = DEFAULT_TIME_BUCKETS) -> Histogram:
+    """Return the histogram registered under *name*, creating it on first use."""
+    with _lock:
+        if name not in _histograms:
+            _histograms[name] = Histogram(name, buckets)
+        return _histograms[name]
+
+
+def register_gauge(name: str, callback: Callable[[], Any]) -> None:
+    """Register a callback whose return value is reported under *name*."""
+    with _lock:
+        _gauges[name] = callback
+
+
+def snapshot() -> dict[str, Any]:
+    with _lock:
+        histograms = dict(_histograms)
+        gauges = dict(_gauges)
+    gauge_values = {}
+    for name, callback in gauges.items():
+        try:
+            gauge_values[name] = callback()
+        except Exception as e:
+            gauge_values[name] = {"error": str(e)}
+    return {
+        "histograms": {name: h.snapshot() for name, h in histograms.items()},
+        "gauges": gauge_values,
+    }
@@ -1,7 +1,15 @@
 """
 JWT token creation and verification utilities.
 Uses python-jose for JWT operations and passlib/bcrypt for password hashing.
+
+Verified tokens are memoized by SHA-256 digest until their `exp`, so a
+client polling with the same bearer token pays for HMAC verification once.
+Revoked tokens, and revoked refresh-token families (the `fam` claim), are
+remembered until they would have expired anyway.
 """
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any
 from uuid import UUID
@@ -10,9 +18,14 @@ from jose import jwt, JWTError
 
 from app.config.settings import get_settings
 from app.config.logging import get_logger
+from app.utils import metrics
+from app.utils.cache import TTLCache
 
 logger = get_logger("utils.security")
 
+# Revocations are purged at most this often once they have expired.
+REVOCATION_PURGE_INTERVAL_SECONDS = 60
+
 
 def create_access_token(
     subject: str | UUID,
@@ -39,11 +52,14 @@ def create_access_token(
 
 def create_refresh_token(
     subject: str | UUID,
+    jti: Optional[str] = None,
+    family_id: Optional[str] = None,
+    expires_at: Optional[datetime] = None,
 ) -> str:
-    """Create a long-lived JWT refresh token."""
+    """Create a long-lived JWT refresh token, identified by *jti* within token family *family_id*."""
     settings = get_settings()
     now = datetime.now(timezone.utc)
-    expire = now + timedelta(days=settings.refresh_token_expire_days)
+    expire = expires_at or now + timedelta(days=settings.refresh_token_expire_days)
 
     claims = {
         "sub": str(subject),
@@ -51,14 +67,84 @@ def create_refresh_token(
         "iat": now,
         "exp": expire,
     }
+    if jti:
+        claims["jti"] = jti
+    if family_id:
+        claims["fam"] = family_id
     return jwt.encode(claims, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
-def decode_token(token: str) -> dict[str, Any] | None:
-    """
-    Decode and verify a JWT token.
-    Returns the payload dict on success, None if the token is invalid/expired.
-    """
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+_token_cache: Optional[TTLCache] = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache() -> Optional[TTLCache]:
+    """Cache of verified token digests -> payloads, or None when JWT_CACHE_MAX_ENTRIES is 0."""
+    global _token_cache
+    if _token_cache is None:
+        max_entries = get_settings().jwt_cache_max_entries
+        if max_entries <= 0:
+            return None
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = TTLCache(max_entries=max_entries)
+                metrics.register_gauge("auth.token_cache", _token_cache.stats)
+    return _token_cache
+
+
+# digest -> token exp (epoch seconds); kept in a plain dict rather than an LRU
+# so a revocation can never be evicted while the token is still valid.
+_revoked_tokens: dict[bytes, float] = {}
+_revoked_lock = threading.Lock()
+_revoked_purged_at = 0.0
+
+
+def revoke_token(token: str) -> None:
+    """Reject *token* from now on in this process, until it expires on its own."""
+    global _revoked_purged_at
+    digest = _token_digest(token)
+    payload = _decode_uncached(token)
+    now = time.time()
+    expires_at = float(payload["exp"]) if payload and "exp" in payload else now
+    with _revoked_lock:
+        _revoked_tokens[digest] = expires_at
+        if now - _revoked_purged_at > REVOCATION_PURGE_INTERVAL_SECONDS:
+            for key in [k for k, exp in _revoked_tokens.items() if exp <= now]:
+                del _revoked_tokens[key]
+            _revoked_purged_at = now
+    cache = get_token_cache()
+    if cache is not None:
+        cache.pop(digest)
+
+
+# family id -> latest expiry of any token in it. Filled by the refresh-token
+# store; checked on every verification, so it has to stay a plain dict lookup.
+_revoked_families: dict[str, float] = {}
+
+
+def mark_family_revoked(family_id: str, expires_at: float) -> None:
+    """Reject every token carrying `fam` == *family_id* until *expires_at* (epoch seconds)."""
+    current = _revoked_families.get(family_id, 0.0)
+    _revoked_families[family_id] = max(current, expires_at)
+
+
+def purge_revoked_families(now: Optional[float] = None) -> int:
+    now = now if now is not None else time.time()
+    expired = [family for family, exp in list(_revoked_families.items()) if exp <= now]
+    for family in expired:
+        _revoked_families.pop(family, None)
+    return len(expired)
+
+
+def revoked_family_count() -> int:
+    return len(_revoked_families)
+
+
+def _decode_uncached(token: str) -> dict[str, Any] | None:
     settings = get_settings()
     try:
         payload = jwt.decode(
@@ -72,6 +158,38 @@ def decode_token(token: str) -> dict[str, Any] | None:
         return None
 
 
+def decode_token(token: str) -> dict[str, Any] | None:
+    """
+    Decode and verify a JWT token.
+    Returns the payload dict on success, None if the token is invalid/expired
+    or has been revoked.
+    """
+    digest = _token_digest(token)
+    if digest in _revoked_tokens:
+        return None
+
+    cache = get_token_cache()
+    if cache is not None:
+        payload = cache.get(digest)
+        if payload is not None:
+            if payload.get("fam") in _revoked_families:
+                return None
+            return dict(payload)
+
+    payload = _decode_uncached(token)
+    if payload is None:
+        return None
+    if payload.get("fam") in _revoked_families:
+        logger.warning("Token belongs to a revoked token family")
+        return None
+
+    if cache is not None and "exp" in payload:
+        remaining = float(payload["exp"]) - time.time()
+        if remaining > 0:
+            cache.set(digest, payload, ttl_seconds=remaining)
+    return dict(payload)
+
+
 def verify_access_token(token: str) -> dict[str, Any] | None:
     """Decode token and ensure it is an access token."""
     payload = decode_token(token)
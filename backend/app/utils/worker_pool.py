@@ -0,0 +1,117 @@
+"""
+Bounded executor for running blocking or CPU-heavy work off the event loop.
+"""
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.config.logging import get_logger
+
+logger = get_logger("utils.worker_pool")
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a pool already holds as much work as it is allowed to queue."""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+        super().__init__(f"Worker pool '{pool_name}' is saturated")
+
+
+class WorkerPool:
+    """
+    Thread or process pool with a hard cap on outstanding work.
+
+    At most ``max_workers + max_queue`` jobs may be running or waiting at once;
+    further submissions fail fast with ``PoolSaturatedError`` instead of piling
+    up behind the executor's unbounded internal queue. A slot is released only
+    when the job really finishes, so a timed-out job that is still running keeps
+    counting against the limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 16,
+        retry_after_seconds: int = 5,
+    ):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            logger.info(f"Worker pool '{self.name}' started ({self.kind}, {self.max_workers} workers)")
+        return self._executor
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._outstanding -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run ``fn(*args)`` on the pool and await its result.
+
+        Raises ``PoolSaturatedError`` when the queue is full and
+        ``asyncio.TimeoutError`` when the job exceeds *timeout* seconds.
+        """
+        with self._lock:
+            if self._outstanding >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturatedError(self.name, self.retry_after_seconds)
+            self._outstanding += 1
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._outstanding -= 1
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            logger.warning(f"Job on worker pool '{self.name}' timed out after {timeout}s")
+            raise
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            outstanding = self._outstanding
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(outstanding, self.max_workers),
+            "queued": max(0, outstanding - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info(f"Worker pool '{self.name}' shut down")
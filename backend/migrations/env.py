@@ -0,0 +1,76 @@
+"""
+Alembic environment for the async engine.
+
+Runs against the app's own engine (``app.db.session.get_engine``) so the URL
+rewriting and pgbouncer settings match the application. When the app
+migrates at startup it passes its open connection in
+``config.attributes["connection"]`` and no new engine is created.
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.session import Base, close_db, get_database_url, get_engine
+import app.db.models  # noqa: F401  (registers every table on Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def _configure(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        # 0003 builds indexes CONCURRENTLY in an autocommit block, which needs
+        # each revision in its own transaction.
+        transaction_per_migration=True,
+        # SQLite cannot ALTER most things in place; batch mode rebuilds the table.
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+
+def _run_sync(connection) -> None:
+    _configure(connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def _run_async() -> None:
+    try:
+        async with get_engine().connect() as connection:
+            await connection.run_sync(_run_sync)
+            await connection.commit()
+    finally:
+        await close_db()
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of connecting (``upgrade --sql``)."""
+    context.configure(
+        url=get_database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_sync(connection)
+    else:
+        asyncio.run(_run_async())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,158 @@
+"""Initial schema: the baseline tables, as created by create_all before migrations existed.
+
+Databases that were created with create_all on the baseline schema are
+already at this revision; mark them with `python -m app.db.migrate stamp 0001`
+and then upgrade.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns() -> list[sa.Column]:
+    """Columns of `BaseModel`: id, timestamps and the soft-delete flag."""
+    return [
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        *_timestamp_columns(),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _timestamp_columns() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=True),
+        sa.Column("full_name", sa.String(length=255), nullable=True),
+        sa.Column("avatar_url", sa.String(length=500), nullable=True),
+        sa.Column("user_type", sa.String(length=20), nullable=False),
+        sa.Column("provider", sa.String(length=50), nullable=True),
+        sa.Column("provider_id", sa.String(length=255), nullable=True),
+        sa.Column("email_verified", sa.String(length=1), nullable=True),
+        *_base_columns(),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "organizations",
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"),
+                  nullable=False, unique=True),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("website", sa.String(length=500), nullable=True),
+        sa.Column("industry", sa.String(length=100), nullable=True),
+        sa.Column("logo_url", sa.String(length=500), nullable=True),
+        sa.Column("contact_email", sa.String(length=255), nullable=False),
+        *_base_columns(),
+    )
+
+    op.create_table(
+        "candidates",
+        sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"),
+                  nullable=False, unique=True),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("full_name", sa.String(length=255), nullable=False),
+        sa.Column("phone", sa.String(length=20), nullable=True),
+        sa.Column("education", sa.Text(), nullable=True),
+        sa.Column("experience_years", sa.Integer(), nullable=True),
+        sa.Column("skills", sa.JSON(), nullable=True),
+        sa.Column("resume_url", sa.String(length=500), nullable=True),
+        sa.Column("linkedin_url", sa.String(length=500), nullable=True),
+        sa.Column("portfolio_url", sa.String(length=500), nullable=True),
+        sa.Column("ats_score", sa.Float(), nullable=True),
+        sa.Column("resume_category", sa.String(length=100), nullable=True),
+        *_base_columns(),
+    )
+    op.create_index("ix_candidates_email", "candidates", ["email"])
+
+    op.create_table(
+        "job_roles",
+        sa.Column("organization_id", sa.String(length=36), sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+                  nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("required_skills", sa.JSON(), nullable=True),
+        sa.Column("preferred_skills", sa.JSON(), nullable=True),
+        sa.Column("min_experience_years", sa.Integer(), nullable=True),
+        sa.Column("max_experience_years", sa.Integer(), nullable=True),
+        sa.Column("education_requirement", sa.String(length=255), nullable=True),
+        sa.Column("salary_range_min", sa.Integer(), nullable=True),
+        sa.Column("salary_range_max", sa.Integer(), nullable=True),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("is_remote", sa.Boolean(), nullable=True),
+        sa.Column("cutoff_score", sa.Float(), nullable=True),
+        *_base_columns(),
+    )
+
+    op.create_table(
+        "interview_questions",
+        sa.Column("job_role_id", sa.String(length=36), sa.ForeignKey("job_roles.id", ondelete="CASCADE"),
+                  nullable=False),
+        sa.Column("question_text", sa.Text(), nullable=False),
+        sa.Column("question_type", sa.String(length=20), nullable=True),
+        sa.Column("expected_answer_keywords", sa.JSON(), nullable=True),
+        sa.Column("max_score", sa.Float(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=True),
+        *_base_columns(),
+    )
+
+    op.create_table(
+        "interviews",
+        sa.Column("candidate_id", sa.String(length=36), sa.ForeignKey("candidates.id", ondelete="CASCADE"),
+                  nullable=False),
+        sa.Column("job_role_id", sa.String(length=36), sa.ForeignKey("job_roles.id", ondelete="CASCADE"),
+                  nullable=False),
+        sa.Column("scheduled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("ats_score", sa.Float(), nullable=True),
+        sa.Column("interview_score", sa.Float(), nullable=True),
+        sa.Column("final_score", sa.Float(), nullable=True),
+        sa.Column("is_shortlisted", sa.Boolean(), nullable=True),
+        sa.Column("feedback", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        *_base_columns(),
+    )
+
+    op.create_table(
+        "interview_responses",
+        sa.Column("interview_id", sa.String(length=36), sa.ForeignKey("interviews.id", ondelete="CASCADE"),
+                  nullable=False),
+        sa.Column("question_id", sa.String(length=36), sa.ForeignKey("interview_questions.id", ondelete="CASCADE"),
+                  nullable=False),
+        sa.Column("response_text", sa.Text(), nullable=True),
+        sa.Column("response_score", sa.Float(), nullable=True),
+        sa.Column("confidence_level", sa.Float(), nullable=True),
+        sa.Column("relevance_score", sa.Float(), nullable=True),
+        sa.Column("cheating_detected", sa.Boolean(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        *_base_columns(),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        "interview_responses", "interviews", "interview_questions", "job_roles",
+        "candidates", "organizations", "users",
+    ):
+        op.drop_table(table)
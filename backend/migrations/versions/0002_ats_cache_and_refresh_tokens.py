@@ -0,0 +1,64 @@
+"""ATS result cache and server-side refresh tokens.
+
+Tables that already exist are left alone, so a database created by
+create_all after these models were added can be stamped 0001 and upgraded
+like one on the baseline schema.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamp_columns() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "ats_result_cache" not in existing:
+        op.create_table(
+            "ats_result_cache",
+            sa.Column("cache_key", sa.String(length=64), primary_key=True),
+            sa.Column("prompt_version", sa.String(length=20), nullable=False),
+            sa.Column("model_name", sa.String(length=100), nullable=False),
+            sa.Column("result", sa.JSON(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            *_timestamp_columns(),
+        )
+        op.create_index("ix_ats_result_cache_expires_at", "ats_result_cache", ["expires_at"])
+
+    if "refresh_tokens" not in existing:
+        op.create_table(
+            "refresh_tokens",
+            sa.Column("jti", sa.String(length=36), primary_key=True),
+            sa.Column("family_id", sa.String(length=36), nullable=False),
+            sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"),
+                      nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("used_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
+            *_timestamp_columns(),
+        )
+        op.create_index("ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"])
+        op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+        op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("refresh_tokens")
+    op.drop_table("ats_result_cache")
@@ -0,0 +1,69 @@
+"""Dashboard indexes: per-role leaderboard and pipeline, candidate history, question sheets.
+
+On PostgreSQL the indexes are built CONCURRENTLY outside the migration
+transaction, so writes to the large tables are not blocked while they build.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Spelled the way each dialect compiles `Model.is_active == True`; SQLite only
+# uses a partial index when the query's predicate matches it textually.
+ACTIVE_WHERE = {"postgresql_where": sa.text("is_active = true"), "sqlite_where": sa.text("is_active = 1")}
+
+# (name, table, columns, active only) — keep in sync with app/db/models/*.py
+INDEXES = [
+    ("ix_interviews_role_final_score_active", "interviews",
+     ["job_role_id", sa.text("final_score DESC")], True),
+    ("ix_interviews_role_status_active", "interviews",
+     ["job_role_id", "status", sa.text("created_at DESC")], True),
+    ("ix_interviews_candidate_created", "interviews",
+     ["candidate_id", sa.text("created_at DESC")], False),
+    ("ix_interview_questions_role_order_active", "interview_questions",
+     ["job_role_id", "order_index"], True),
+    ("ix_interview_responses_interview_question", "interview_responses",
+     ["interview_id", "question_id"], False),
+    ("ix_interview_responses_question", "interview_responses",
+     ["question_id"], False),
+    ("ix_job_roles_org_created_active", "job_roles",
+     ["organization_id", sa.text("created_at DESC")], True),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    postgresql = _is_postgresql()
+    with op.get_context().autocommit_block() if postgresql else nullcontext():
+        for name, table, columns, active_only in INDEXES:
+            where = ACTIVE_WHERE if active_only else {}
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=postgresql,
+                **where,
+            )
+    if postgresql:
+        for table in sorted({table for _, table, _, _ in INDEXES}):
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    postgresql = _is_postgresql()
+    with op.get_context().autocommit_block() if postgresql else nullcontext():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=postgresql)
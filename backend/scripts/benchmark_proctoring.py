@@ -0,0 +1,112 @@
+"""
+Drive the proctoring worker pool with many synthetic camera streams.
+
+Every stream replays the given JPEG frames at a fixed rate, the way a
+browser would send them, and the run reports analyzed FPS, lag and dropped
+frames for each worker count. Total FPS should grow linearly with workers
+until they outnumber the machine's cores:
+
+    python scripts/benchmark_proctoring.py "clip/*.jpg" --streams 16 --fps 10 --workers 1 2 4 8
+
+Export frames from a recorded interview with e.g.
+`ffmpeg -i interview.mp4 -vf fps=10 clip/%05d.jpg`. The workers need dlib,
+OpenCV and the landmark model, exactly as in the API.
+"""
+import argparse
+import asyncio
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./proctoring_bench.db")
+
+from app.proctoring.pool import DEFAULT_ANALYZER_DIR, ProctoringPool  # noqa: E402
+
+
+async def replay(stream, frames: list[bytes], fps: float, seconds: float) -> None:
+    interval = 1.0 / fps
+    started = time.monotonic()
+    index = 0
+    while time.monotonic() - started < seconds:
+        stream.offer(frames[index % len(frames)])
+        index += 1
+        # Sleep to the next frame's slot so senders don't drift when the loop is busy.
+        await asyncio.sleep(max(0.0, started + index * interval - time.monotonic()))
+
+
+async def drain(stream) -> None:
+    while True:
+        await stream.next_message()
+
+
+async def run(workers: int, args, frames: list[bytes]) -> dict:
+    pool = ProctoringPool(
+        workers=workers,
+        max_streams_per_worker=args.streams,
+        analyzer_dir=args.analyzer_dir,
+        predictor_path=args.predictor_path,
+        analyzer_config={"detect_every": args.detect_every, "detection_scale": args.detection_scale},
+        stats_window_seconds=args.seconds,
+    )
+    await pool.start()
+    try:
+        streams = [await pool.open_stream(f"bench-{i}") for i in range(args.streams)]
+        drains = [asyncio.create_task(drain(stream)) for stream in streams]
+        started = time.monotonic()
+        await asyncio.gather(*(replay(stream, frames, args.fps, args.seconds) for stream in streams))
+        elapsed = time.monotonic() - started
+        for task in drains:
+            task.cancel()
+        stats = [stream.stats for stream in streams]
+        for stream in streams:
+            await pool.close_stream(stream)
+    finally:
+        await pool.shutdown()
+
+    per_stream_fps = [s.processed / elapsed for s in stats]
+    received = sum(s.received for s in stats)
+    return {
+        "workers": workers,
+        "total_fps": sum(per_stream_fps),
+        "min_stream_fps": min(per_stream_fps),
+        "avg_lag_ms": statistics.mean(s.avg_lag_ms for s in stats if s.avg_lag_ms is not None),
+        "max_lag_ms": max(s.max_lag_ms for s in stats),
+        "dropped_pct": 100.0 * sum(s.dropped for s in stats) / received if received else 0.0,
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("frames", help="Glob of JPEG frames to replay")
+    parser.add_argument("--streams", type=int, default=8)
+    parser.add_argument("--fps", type=float, default=10.0, help="Frames sent per second per stream")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--analyzer-dir", default=DEFAULT_ANALYZER_DIR)
+    parser.add_argument("--predictor-path", default=None)
+    parser.add_argument("--detect-every", type=int, default=1)
+    parser.add_argument("--detection-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    frames = [open(path, "rb").read() for path in sorted(glob.glob(args.frames))]
+    if not frames:
+        parser.error(f"no frames match {args.frames}")
+
+    print(f"{args.streams} streams x {args.fps:g} FPS offered ({args.streams * args.fps:g} FPS total), "
+          f"{len(frames)} distinct frames, {args.seconds:g}s per run")
+    baseline = None
+    for workers in args.workers:
+        result = await run(workers, args, frames)
+        baseline = baseline or result["total_fps"]
+        print(f"  {workers:>2} workers: {result['total_fps']:7.1f} FPS total "
+              f"({result['total_fps'] / baseline:4.2f}x), min stream {result['min_stream_fps']:5.1f} FPS, "
+              f"lag avg {result['avg_lag_ms']:6.1f} ms / max {result['max_lag_ms']:6.1f} ms, "
+              f"dropped {result['dropped_pct']:4.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,90 @@
+"""
+`GazeHistory` must agree with the list-based window it replaced (append,
+``pop(0)``, ``np.std`` and a step-length count over the whole list), since
+the cheat thresholds were tuned on those numbers.
+"""
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.proctoring.pool import DEFAULT_ANALYZER_DIR
+from app.proctoring.worker import _load_analyzer
+
+gaze_analyzer = _load_analyzer(DEFAULT_ANALYZER_DIR)
+GazeHistory = gaze_analyzer.GazeHistory
+
+STEP_THRESHOLD = 5.0
+STD_TOLERANCE = 1e-3  # pixels
+RANDOM_PUSHES = 100_000
+
+
+class ListHistory:
+    """The original window: a list trimmed with pop(0), statistics recomputed from scratch."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.points = []
+
+    def push(self, point: tuple):
+        self.points.append(point)
+        if len(self.points) > self.size:
+            self.points.pop(0)
+
+    def std(self) -> tuple:
+        return tuple(np.std(np.asarray(self.points, dtype=np.float64), axis=0))
+
+    def movement_changes(self) -> int:
+        return sum(1 for a, b in zip(self.points, self.points[1:]) if math.dist(a, b) > STEP_THRESHOLD)
+
+
+def gaze_points(rng: random.Random, count: int):
+    """Screen-scale gaze centers: jitter, quick jumps and perfectly still stretches."""
+    x, y = 320.0, 240.0
+    while count > 0:
+        mode = rng.random()
+        run = min(count, rng.randint(1, 80))
+        count -= run
+        for _ in range(run):
+            if mode < 0.4:
+                x, y = x + rng.gauss(0, 2), y + rng.gauss(0, 2)
+            elif mode < 0.7:
+                x, y = x + rng.uniform(-40, 40), y + rng.uniform(-40, 40)
+            elif mode < 0.8:
+                x, y = rng.uniform(0, 1920), rng.uniform(0, 1080)
+            yield x, y
+
+
+@pytest.mark.parametrize("size, resync_every, pushes", [
+    (30, GazeHistory.RESYNC_EVERY, RANDOM_PUSHES),
+    (7, 101, RANDOM_PUSHES // 5),
+    (1, GazeHistory.RESYNC_EVERY, RANDOM_PUSHES // 5),
+])
+def test_matches_list_window(monkeypatch, size, resync_every, pushes):
+    monkeypatch.setattr(GazeHistory, "RESYNC_EVERY", resync_every)
+    rng = random.Random(size)
+    history, reference = GazeHistory(size, STEP_THRESHOLD), ListHistory(size)
+    for i, point in enumerate(gaze_points(rng, pushes)):
+        history.push(point)
+        reference.push(point)
+        assert len(history) == len(reference.points)
+        assert history.movement_changes() == reference.movement_changes(), i
+        # Sub-millipixel differences are rounding left by large jumps leaving the window.
+        std, expected = history.std(), reference.std()
+        assert std == pytest.approx(expected, rel=1e-6, abs=STD_TOLERANCE), i
+        # An axis that is perfectly still reads exactly 0, not rounding residue.
+        for axis in range(2):
+            if expected[axis] == 0.0:
+                assert std[axis] == 0.0, i
+    np.testing.assert_array_equal(history.array(), np.asarray(reference.points))
+
+
+def test_still_gaze_after_movement_reads_zero():
+    history = GazeHistory(30, STEP_THRESHOLD)
+    for point in gaze_points(random.Random(3), 5_000):
+        history.push(point)
+    for _ in range(30):
+        history.push((1234.5678, 987.654321))
+    assert history.std() == (0.0, 0.0)
+    assert history.movement_changes() == 0
@@ -0,0 +1,83 @@
+"""
+Worker crashes must fail the affected streams cleanly: no close may hang and
+no dead stream may block a reconnect. The analyzer is replaced by a stub
+process, so these run without dlib or OpenCV.
+"""
+import asyncio
+import os
+
+import pytest
+
+from app.proctoring import pool as pool_module
+from app.proctoring.pool import ProctoringPool
+
+CRASH = b"crash"
+TIMEOUT_SECONDS = 15.0
+
+
+def stub_worker(conn, analyzer_dir, predictor_path, config) -> None:
+    """Speaks the worker protocol; exits abruptly on a ``crash`` frame or when closing a ``crash-*`` stream."""
+    conn.send(("ready", os.getpid()))
+    while True:
+        message = conn.recv()
+        if message is None:
+            return
+        kind, stream_id = message[0], message[1]
+        if kind == "close":
+            if stream_id.startswith("crash"):
+                os._exit(1)
+            conn.send(("summary", stream_id, {"frames": 0}))
+        elif message[3] == CRASH:
+            os._exit(1)
+        else:
+            conn.send(("event", stream_id, {"cheating": False}, 0.0))
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    monkeypatch.setattr(pool_module, "worker_main", stub_worker)
+    return lambda: ProctoringPool(workers=1, max_streams_per_worker=4, analyzer_dir="", start_timeout=TIMEOUT_SECONDS)
+
+
+def test_crash_during_close_resolves_the_close(make_pool):
+    async def scenario():
+        pool = make_pool()
+        try:
+            stream = await pool.open_stream("crash-1")
+            old_pid = pool.workers[0].process.pid
+            summary = await asyncio.wait_for(pool.close_stream(stream), TIMEOUT_SECONDS)
+            assert summary is None
+
+            # Waits for the respawn _recover started.
+            reopened = await pool.open_stream("other")
+            assert pool.workers[0].process.pid != old_pid
+            assert await asyncio.wait_for(pool.close_stream(reopened), TIMEOUT_SECONDS) == {"frames": 0}
+        finally:
+            await pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_crash_during_frame_frees_the_stream(make_pool):
+    async def scenario():
+        pool = make_pool()
+        try:
+            stream = await pool.open_stream("interview-1")
+            old_conn = pool.workers[0].conn
+            stream.offer(CRASH)
+            message = await asyncio.wait_for(stream.next_message(), TIMEOUT_SECONDS)
+            assert message["fatal"] is True
+            assert old_conn.closed
+            # The handler has not closed the stream yet; a reconnect must not be a duplicate.
+            assert "interview-1" not in pool.stats()["streams"]
+            reconnected = await pool.open_stream("interview-1")
+
+            assert await asyncio.wait_for(pool.close_stream(stream), TIMEOUT_SECONDS) is None
+            assert pool.streams["interview-1"] is reconnected
+            reconnected.offer(b"frame")
+            message = await asyncio.wait_for(reconnected.next_message(), TIMEOUT_SECONDS)
+            assert message["type"] == "event"
+        finally:
+            await pool.shutdown()
+
+    asyncio.run(scenario())
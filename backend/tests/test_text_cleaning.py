@@ -0,0 +1,55 @@
+"""
+`clean_resume_text` must reproduce the original seven-regex cleaner exactly,
+since the categorizer's TF-IDF vocabulary was fitted on that output.
+"""
+import random
+import re
+
+import pytest
+
+from app.utils.text_cleaning import clean_resume_text
+
+# Alphabet dense in the pieces where the single-pass regex could diverge:
+# cc/RT word boundaries, URLs cutting hashtags and mentions, non-ASCII and
+# the ASCII separators that \s treats as whitespace.
+PIECES = [
+    "cc", "CC", "RT", "rt", "http", "https://x.io/a?b=1", "#", "@", "-", ".", "_", " ", "\n", "\t",
+    "a", "b", "é", "ß", "İ", " ", " ", "\x1c", "\x00", "7", "c", "h", "t", "p",
+    "www", "C++", "node.js", "e-mail", "jane@doe.com", "!!", "​",
+]
+RANDOM_SAMPLES = 50_000
+
+
+def clean_resume_reference(txt: str) -> str:
+    """The original multi-pass cleaner."""
+    txt = txt.lower()
+    txt = re.sub(r"http\S*", " ", txt)
+    txt = re.sub(r"\b(RT|cc)\b", " ", txt)
+    txt = re.sub(r"#\S*", " ", txt)
+    txt = re.sub(r"@\S+", " ", txt)
+    txt = re.sub(r"[%s]" % re.escape(r"""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), " ", txt)
+    txt = re.sub(r"[^\x00-\x7f]", " ", txt)
+    txt = re.sub(r"\s+", " ", txt).strip()
+    return txt
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "   ",
+    "Senior Engineer @ Acme — https://acme.io/jobs #hiring",
+    "cc: hiring team, RT this",
+    "cchttp://x.io",
+    "accounting, cc'd the CFO",
+    "#tag@mention http",
+    "C++ / node.js / e-mail",
+    "Résumé\x1cwith odd spaces\x00",
+])
+def test_matches_original_on_known_cases(text):
+    assert clean_resume_text(text) == clean_resume_reference(text)
+
+
+def test_matches_original_on_random_text():
+    rng = random.Random(7)
+    for _ in range(RANDOM_SAMPLES):
+        sample = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 14)))
+        assert clean_resume_text(sample) == clean_resume_reference(sample), repr(sample)
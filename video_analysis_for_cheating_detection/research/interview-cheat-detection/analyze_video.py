@@ -0,0 +1,85 @@
+"""
+Run the gaze analyzer over recorded interviews, without a display.
+
+    python analyze_video.py interview.mp4
+    python analyze_video.py recordings/*.mp4 --events-dir events/ --stride 2
+    python analyze_video.py frames_dir/ --fps 15          # image sequence
+    python analyze_video.py interview.mp4 --detect-every 5 --detection-scale 0.5   # tracking mode
+
+Prints one JSON summary per input, including how many times faster than
+real time it was processed. --events-dir also writes per-frame events as
+JSON lines.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from gaze_analyzer import DEFAULT_PREDICTOR_PATH, GazeAnalyzer, GazeConfig, frames_from_images, frames_from_video
+
+
+def analyze(analyzer: GazeAnalyzer, source: str, args) -> dict:
+    analyzer.reset()
+    if os.path.isdir(source):
+        frames = frames_from_images(source, fps=args.fps)
+    else:
+        frames = frames_from_video(source, stride=args.stride, max_frames=args.max_frames)
+
+    events_file = None
+    if args.events_dir:
+        os.makedirs(args.events_dir, exist_ok=True)
+        name = os.path.splitext(os.path.basename(os.path.normpath(source)))[0]
+        events_file = open(os.path.join(args.events_dir, f"{name}.jsonl"), "w")
+
+    started = time.perf_counter()
+    last_timestamp = 0.0
+    try:
+        for event in analyzer.run(frames):
+            last_timestamp = event.timestamp or last_timestamp
+            if events_file is not None:
+                events_file.write(json.dumps(event.to_dict()) + "\n")
+    finally:
+        if events_file is not None:
+            events_file.close()
+    wall = time.perf_counter() - started
+
+    result = {"source": source, **analyzer.summary().to_dict()}
+    result["wall_seconds"] = round(wall, 3)
+    result["video_seconds"] = round(last_timestamp, 3)
+    result["realtime_factor"] = round(last_timestamp / wall, 2) if wall > 0 else None
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="Video files or directories of frame images")
+    parser.add_argument("--predictor", default=DEFAULT_PREDICTOR_PATH, help="dlib 68-landmark model")
+    parser.add_argument("--stride", type=int, default=1, help="Analyze every Nth video frame")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--fps", type=float, default=30.0, help="Frame rate of image sequences")
+    parser.add_argument("--detect-every", type=int, default=1,
+                        help="Run the face detector every Nth frame and track in between (1 = every frame)")
+    parser.add_argument("--detection-scale", type=float, default=1.0, help="Downscale frames for detection only")
+    parser.add_argument("--detection-upsample", type=int, default=0)
+    parser.add_argument("--events-dir", default=None, help="Write per-frame events as JSON lines here")
+    args = parser.parse_args()
+
+    config = GazeConfig(
+        detect_every=args.detect_every,
+        detection_scale=args.detection_scale,
+        detection_upsample=args.detection_upsample,
+    )
+    analyzer = GazeAnalyzer(config, predictor_path=args.predictor)
+    failed = 0
+    for source in args.sources:
+        try:
+            print(json.dumps(analyze(analyzer, source, args)))
+        except IOError as e:
+            print(f"{source}: {e}", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Microbenchmark of the per-frame Python work in the gaze loop.
+
+Feeds synthetic 68-point landmarks (a random walk of the face) through:
+
+- legacy: the original computer_vision.py code — per-point landmarks.part()
+  list comprehensions, scipy distance calls and the history generator.
+- current: GazeAnalyzer._update_face — one landmark array per face and
+  numpy expressions for EAR, eye centers and movement.
+
+Detection and landmark prediction are excluded (no camera, dlib or cv2
+needed), so the numbers isolate the overhead this code controls.
+
+    python bench_gaze_loop.py --frames 20000
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.spatial import distance
+
+from gaze_analyzer import FrameEvent, GazeAnalyzer, LEFT_EYE, RIGHT_EYE, shape_to_array
+
+
+class _Point:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x, self.y = int(x), int(y)
+
+
+class _Shape:
+    """Stands in for dlib.full_object_detection: part(i) and parts()."""
+
+    def __init__(self, points):
+        self._points = [_Point(x, y) for x, y in points]
+
+    def part(self, i):
+        return self._points[i]
+
+    def parts(self):
+        return self._points
+
+
+def synthetic_shapes(frames: int, seed: int = 7) -> list:
+    rng = np.random.default_rng(seed)
+    face = rng.uniform(-30, 30, (68, 2))
+    centers = np.clip(np.cumsum(rng.normal(0, 4, (frames, 2)), axis=0) + (320, 240), 60, 420)
+    return [_Shape(face + center) for center in centers]
+
+
+def legacy_frame(landmarks, state, width, height):
+    """The original per-face metric code, kept verbatim for comparison."""
+    def eye_aspect_ratio(eye):
+        A = distance.euclidean(eye[1], eye[5])
+        B = distance.euclidean(eye[2], eye[4])
+        C = distance.euclidean(eye[0], eye[3])
+        return (A + B) / (2.0 * C)
+
+    def get_gaze_ratio(eye_points, landmarks):
+        eye_region = np.array([(landmarks.part(point).x, landmarks.part(point).y)
+                               for point in eye_points], dtype=np.int32)
+        return np.mean(eye_region, axis=0).astype(int)
+
+    gaze_history = state["gaze_history"]
+    left_eye = np.array([(landmarks.part(n).x, landmarks.part(n).y) for n in LEFT_EYE])
+    right_eye = np.array([(landmarks.part(n).x, landmarks.part(n).y) for n in RIGHT_EYE])
+    left_center = get_gaze_ratio(LEFT_EYE, landmarks)
+    right_center = get_gaze_ratio(RIGHT_EYE, landmarks)
+    avg_center = ((left_center[0] + right_center[0]) // 2, (left_center[1] + right_center[1]) // 2)
+    gaze_history.append(avg_center)
+    if len(gaze_history) > 30:
+        gaze_history.pop(0)
+    if len(gaze_history) > 10:
+        gaze_std = np.std(gaze_history, axis=0)
+        total_std = gaze_std[0] + gaze_std[1]
+        if total_std < 5.0:
+            distance.euclidean(avg_center, (width // 2, height // 2))
+        else:
+            sum(1 for i in range(1, len(gaze_history))
+                if distance.euclidean(gaze_history[i], gaze_history[i - 1]) > 5)
+    return (eye_aspect_ratio(left_eye) + eye_aspect_ratio(right_eye)) / 2.0
+
+
+def bench(label: str, fn, shapes: list) -> float:
+    started = time.perf_counter()
+    for shape in shapes:
+        fn(shape)
+    per_frame = (time.perf_counter() - started) / len(shapes) * 1e6
+    print(f"{label:<8} {per_frame:8.1f} µs/frame")
+    return per_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    width, height = 640, 480
+    shapes = synthetic_shapes(args.frames)
+
+    legacy_state = {"gaze_history": []}
+    legacy = bench("legacy", lambda shape: legacy_frame(shape, legacy_state, width, height), shapes)
+
+    analyzer = GazeAnalyzer(detector=lambda *a: [], predictor=lambda *a: None)
+
+    def current_frame(shape):
+        analyzer._update_face(shape_to_array(shape), width, height, FrameEvent(0, None, 1))
+
+    current = bench("current", current_frame, shapes)
+    print(f"speedup  {legacy / current:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare full detection against tracking mode on a recorded clip.
+
+The clip is decoded once into memory, then analyzed twice: once with the
+HOG detector on every full-resolution frame (the reference), and once with
+the given --detect-every / --detection-scale settings. The script reports
+frames per second for each run, plus how closely tracking mode reproduces
+the reference:
+
+    python benchmark_tracking.py test_clip.mp4 --detect-every 5 --detection-scale 0.5
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from gaze_analyzer import DEFAULT_PREDICTOR_PATH, GazeAnalyzer, GazeConfig, frames_from_video
+
+
+def run(analyzer: GazeAnalyzer, frames: list) -> tuple:
+    analyzer.reset()
+    started = time.perf_counter()
+    events = list(analyzer.run(frames))
+    return events, len(frames) / (time.perf_counter() - started)
+
+
+def parity(reference: list, candidate: list) -> dict:
+    both = [(r, c) for r, c in zip(reference, candidate) if r.gaze_center and c.gaze_center]
+    errors = np.array([np.hypot(r.gaze_center[0] - c.gaze_center[0], r.gaze_center[1] - c.gaze_center[1])
+                       for r, c in both]) if both else np.zeros(0)
+    n = len(reference)
+    return {
+        "face_presence_agreement": sum((r.faces > 0) == (c.faces > 0) for r, c in zip(reference, candidate)) / n,
+        "cheating_flag_agreement": sum(r.cheating_detected == c.cheating_detected
+                                       for r, c in zip(reference, candidate)) / n,
+        "region_agreement": sum(r.region == c.region for r, c in zip(reference, candidate)) / n,
+        "gaze_error_px_mean": float(errors.mean()) if errors.size else None,
+        "gaze_error_px_p95": float(np.percentile(errors, 95)) if errors.size else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clip")
+    parser.add_argument("--predictor", default=DEFAULT_PREDICTOR_PATH)
+    parser.add_argument("--max-frames", type=int, default=900)
+    parser.add_argument("--detect-every", type=int, default=5)
+    parser.add_argument("--detection-scale", type=float, default=0.5)
+    parser.add_argument("--detection-upsample", type=int, default=0)
+    parser.add_argument("--tracker-confidence", type=float, default=GazeConfig.tracker_min_confidence)
+    args = parser.parse_args()
+
+    frames = list(frames_from_video(args.clip, max_frames=args.max_frames))
+    if not frames:
+        print(f"No frames read from {args.clip}", file=sys.stderr)
+        return 1
+
+    reference = GazeAnalyzer(predictor_path=args.predictor)
+    tracked = GazeAnalyzer(
+        GazeConfig(
+            detect_every=args.detect_every,
+            detection_scale=args.detection_scale,
+            detection_upsample=args.detection_upsample,
+            tracker_min_confidence=args.tracker_confidence,
+        ),
+        detector=reference.detector,
+        predictor=reference.predictor,
+    )
+
+    reference_events, reference_fps = run(reference, frames)
+    tracked_events, tracked_fps = run(tracked, frames)
+    print(json.dumps({
+        "frames": len(frames),
+        "reference_fps": round(reference_fps, 1),
+        "tracking_fps": round(tracked_fps, 1),
+        "speedup": round(tracked_fps / reference_fps, 2),
+        "detector_runs": tracked.summary().detector_runs,
+        "reference_cheating_frames": reference.summary().cheating_frames,
+        "tracking_cheating_frames": tracked.summary().cheating_frames,
+        **parity(reference_events, tracked_events),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,488 @@
+"""
+Headless gaze analysis engine.
+
+`GazeAnalyzer` holds the per-session state that used to live in module
+globals of computer_vision.py (cheat counter, gaze history, region
+transitions) and turns each frame into a `FrameEvent`. It never opens a
+window or a camera: feed it any iterable of frames (video file, image
+sequence, numpy arrays) and read the events and the session summary.
+
+    analyzer = GazeAnalyzer()
+    for event in analyzer.run(frames_from_video("interview.mp4")):
+        ...
+    print(analyzer.summary().to_dict())
+"""
+import glob
+import os
+import math
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+DEFAULT_PREDICTOR_PATH = "shape_predictor_68_face_landmarks.dat"
+
+# Eye landmark indices
+LEFT_EYE = list(range(36, 42))
+RIGHT_EYE = list(range(42, 48))
+EYES = slice(36, 48)  # both eyes, left then right
+# Landmark pairs within one eye whose distances make up the eye aspect ratio
+EAR_FROM = [1, 2, 0]
+EAR_TO = [5, 4, 3]
+
+# Region labels
+QUESTION = "QUESTION"
+ANSWER = "ANSWER"
+
+
+@dataclass
+class GazeConfig:
+    ear_threshold: float = 0.25  # Eye aspect ratio threshold for blink detection
+    gaze_std_threshold: float = 5.0  # Threshold for gaze direction standard deviation
+    consecutive_frames: int = 15  # Cheat counter level that flags cheating
+    history_size: int = 30  # Gaze history kept (1 second at 30fps)
+    min_history: int = 10  # Frames needed before gaze stability is judged
+    movement_step: float = 5.0  # Pixel step counted as a quick eye movement
+    max_movement_changes: int = 15  # Quick movements per history window tolerated
+    transition_history: int = 16  # Region transitions remembered for pattern matching
+    edge_distance: float = 100.0  # Fixed gaze this far from the frame center counts as staring at an edge
+    question_region: tuple = (100, 100, 300, 200)  # (x1, y1, x2, y2) for question area
+    answer_region: tuple = (400, 100, 600, 200)  # (x1, y1, x2, y2) for answer area
+    # Face finding. detect_every=1 runs the HOG detector on every frame; above 1,
+    # faces are followed with dlib correlation trackers between detections and
+    # re-detected early whenever a tracker's confidence (PSR) drops.
+    detect_every: int = 1
+    tracker_min_confidence: float = 7.0
+    detection_scale: float = 1.0  # Downscale factor for the detector only, e.g. 0.5
+    detection_upsample: int = 0  # dlib upsample_num_times; raise it when downscaling small faces
+
+
+@dataclass
+class FrameEvent:
+    frame_index: int
+    timestamp: Optional[float]
+    faces: int
+    gaze_center: Optional[tuple] = None
+    gaze_std: Optional[float] = None  # None while calibrating
+    ear: Optional[float] = None
+    region: Optional[str] = None
+    cheat_counter: int = 0
+    cheating_detected: bool = False
+    suspicious_pattern: bool = False
+    face_box: Optional[tuple] = None  # (left, top, right, bottom) of the last face
+    detected: bool = True  # False when the face came from the tracker
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class SessionSummary:
+    frames: int = 0
+    frames_with_face: int = 0
+    cheating_frames: int = 0
+    suspicious_patterns: int = 0
+    region_transitions: int = 0
+    max_cheat_counter: int = 0
+    detector_runs: int = 0
+    first_cheating_frame: Optional[int] = None
+    processing_seconds: float = 0.0
+    processing_fps: float = 0.0
+    region_frames: dict = field(default_factory=lambda: {QUESTION: 0, ANSWER: 0})
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def shape_to_array(shape) -> np.ndarray:
+    """(68, 2) int array of a dlib full_object_detection, read in one pass."""
+    return np.array([(p.x, p.y) for p in shape.parts()], dtype=np.int64)
+
+
+def eye_aspect_ratios(eyes: np.ndarray) -> np.ndarray:
+    """EAR of each eye in an (n_eyes, 6, 2) array of eye landmarks."""
+    # Vectors p2-p6, p3-p5 and p1-p4 of every eye in one gather.
+    spans = (eyes[:, EAR_FROM] - eyes[:, EAR_TO]).astype(np.float64)
+    lengths = np.sqrt((spans * spans).sum(axis=-1))
+    return (lengths[:, 0] + lengths[:, 1]) / (2.0 * lengths[:, 2])
+
+
+def eye_aspect_ratio(eye):
+    return float(eye_aspect_ratios(np.asarray(eye)[None])[0])
+
+
+def is_gaze_in_region(gaze_center, region):
+    x, y = gaze_center
+    x1, y1, x2, y2 = region
+    return x1 <= x <= x2 and y1 <= y <= y2
+
+
+def to_gray(frame: np.ndarray) -> np.ndarray:
+    """8-bit, contiguous grayscale, as the dlib C++ backend expects."""
+    if frame.ndim == 3:
+        import cv2
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return np.ascontiguousarray(frame, dtype=np.uint8)
+
+
+class GazeHistory:
+    """
+    Last *size* gaze centers in a preallocated ring buffer.
+
+    Pushing is O(1) and so are the window statistics: the per-axis mean and
+    variance are kept with Welford's update, extended to drop the sample
+    that leaves the window, and the number of quick movements is a running
+    count of per-step flags. Memory stays fixed however long the session runs.
+    """
+
+    # Recompute the sums exactly this often, so float drift cannot build up over hours.
+    RESYNC_EVERY = 100_000
+
+    def __init__(self, size: int, step_threshold: float):
+        self.size = size
+        self.step_threshold = step_threshold
+        self._points = np.zeros((size, 2), dtype=np.float64)
+        # _moved[i]: the step into sample i was longer than step_threshold
+        self._moved = np.zeros(size, dtype=bool)
+        self.clear()
+
+    def clear(self):
+        self._start = 0  # index of the oldest sample
+        self._count = 0
+        self._mean_x = self._mean_y = 0.0
+        self._m2_x = self._m2_y = 0.0
+        self._moved_count = 0
+        self._last = None
+        self._pushes = 0
+        # Consecutive pushes that repeated the previous x (y) exactly
+        self._still_x = self._still_y = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, point: tuple):
+        x, y = float(point[0]), float(point[1])
+        moved = self._last is not None and math.hypot(x - self._last[0], y - self._last[1]) > self.step_threshold
+        self._still_x = self._still_x + 1 if self._last is not None and x == self._last[0] else 0
+        self._still_y = self._still_y + 1 if self._last is not None and y == self._last[1] else 0
+        self._last = (x, y)
+
+        if self._count < self.size:
+            slot = (self._start + self._count) % self.size
+            self._count += 1
+            n = self._count
+            dx, dy = x - self._mean_x, y - self._mean_y
+            self._mean_x += dx / n
+            self._mean_y += dy / n
+            self._m2_x += dx * (x - self._mean_x)
+            self._m2_y += dy * (y - self._mean_y)
+        else:
+            # Replace the oldest sample: a windowed Welford step.
+            slot = self._start
+            self._start = (self._start + 1) % self.size
+            old_x, old_y = self._points[slot]
+            mean_x = self._mean_x + (x - old_x) / self.size
+            mean_y = self._mean_y + (y - old_y) / self.size
+            self._m2_x += (x - old_x) * (x - mean_x + old_x - self._mean_x)
+            self._m2_y += (y - old_y) * (y - mean_y + old_y - self._mean_y)
+            self._mean_x, self._mean_y = mean_x, mean_y
+            self._moved_count -= bool(self._moved[slot])
+
+        self._points[slot] = (x, y)
+        self._moved[slot] = moved
+        self._moved_count += moved
+
+        # An axis that holds one value across the whole window restarts its sums
+        # exactly, so a still gaze reads 0 rather than rounding residue left by
+        # the samples that moved out.
+        if self._still_x >= self._count - 1:
+            self._mean_x, self._m2_x = x, 0.0
+        if self._still_y >= self._count - 1:
+            self._mean_y, self._m2_y = y, 0.0
+
+        self._pushes += 1
+        if self._pushes % self.RESYNC_EVERY == 0:
+            self._resync()
+
+    def _resync(self):
+        points = self.array()
+        self._mean_x, self._mean_y = points.mean(axis=0)
+        self._m2_x, self._m2_y = ((points - points.mean(axis=0)) ** 2).sum(axis=0)
+
+    def std(self) -> tuple:
+        """Population standard deviation per axis (matches np.std(history, axis=0))."""
+        n = self._count
+        if n == 0:
+            return 0.0, 0.0
+        # Rounding can leave M2 a hair below zero after a large sample leaves the window.
+        return math.sqrt(max(self._m2_x, 0.0) / n), math.sqrt(max(self._m2_y, 0.0) / n)
+
+    def movement_changes(self) -> int:
+        """Steps between consecutive samples in the window longer than step_threshold."""
+        if self._count == 0:
+            return 0
+        # The oldest sample's step came from a point that has left the window.
+        return self._moved_count - int(self._moved[self._start])
+
+    def array(self) -> np.ndarray:
+        """Samples oldest first, as a new (len, 2) array."""
+        return np.roll(self._points, -self._start, axis=0)[:self._count]
+
+
+class FaceTracker:
+    """Follows one face box between detections with a dlib correlation tracker."""
+
+    def __init__(self, gray: np.ndarray, rect):
+        import dlib
+        self._dlib = dlib
+        self._tracker = dlib.correlation_tracker()
+        self._tracker.start_track(gray, rect)
+
+    def update(self, gray: np.ndarray) -> float:
+        """Move to the face in *gray*; returns the tracker's peak-to-sidelobe ratio."""
+        return self._tracker.update(gray)
+
+    def rect(self):
+        position = self._tracker.get_position()
+        return self._dlib.rectangle(int(position.left()), int(position.top()),
+                                    int(position.right()), int(position.bottom()))
+
+
+class GazeAnalyzer:
+    def __init__(self, config: Optional[GazeConfig] = None, detector=None, predictor=None,
+                 predictor_path: str = DEFAULT_PREDICTOR_PATH):
+        self.config = config or GazeConfig()
+        if detector is None or predictor is None:
+            import dlib
+            detector = detector or dlib.get_frontal_face_detector()
+            predictor = predictor or dlib.shape_predictor(predictor_path)
+        self.detector = detector
+        self.predictor = predictor
+        self.reset()
+
+    def reset(self):
+        """Start a new session."""
+        self.cheat_counter = 0
+        self.gaze_history = GazeHistory(self.config.history_size, self.config.movement_step)
+        self.current_region = None
+        self.time_in_region = 0
+        self.region_transitions = deque(maxlen=self.config.transition_history)
+        self.transition_count = 0
+        self.frame_index = 0
+        self._trackers = []
+        self._frames_since_detection = 0
+        self._summary = SessionSummary()
+
+    def _detect(self, gray: np.ndarray) -> list:
+        cfg = self.config
+        self._summary.detector_runs += 1
+        scale = cfg.detection_scale
+        if scale == 1.0:
+            return list(self.detector(gray, cfg.detection_upsample))
+
+        import cv2
+        import dlib
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        # Map boxes back to full resolution so landmarks stay precise.
+        return [
+            dlib.rectangle(int(r.left() / scale), int(r.top() / scale),
+                           int(r.right() / scale), int(r.bottom() / scale))
+            for r in self.detector(small, cfg.detection_upsample)
+        ]
+
+    def _locate_faces(self, gray: np.ndarray) -> tuple:
+        """Face boxes for this frame and whether the detector produced them."""
+        cfg = self.config
+        if cfg.detect_every <= 1:
+            return self._detect(gray), True
+
+        due = self._frames_since_detection >= cfg.detect_every or not self._trackers
+        if not due:
+            for tracker in self._trackers:
+                if tracker.update(gray) < cfg.tracker_min_confidence:
+                    due = True
+                    break
+        if not due:
+            self._frames_since_detection += 1
+            return [tracker.rect() for tracker in self._trackers], False
+
+        faces = self._detect(gray)
+        self._trackers = [FaceTracker(gray, face) for face in faces]
+        self._frames_since_detection = 1
+        return faces, True
+
+    def process(self, frame: np.ndarray, timestamp: Optional[float] = None) -> FrameEvent:
+        """Analyze one BGR or grayscale frame and return what was seen."""
+        started = time.perf_counter()
+        gray = to_gray(frame)
+        height, width = gray.shape[:2]
+
+        faces, detected = self._locate_faces(gray)
+        event = FrameEvent(frame_index=self.frame_index, timestamp=timestamp, faces=len(faces), detected=detected)
+
+        for face in faces:
+            event.face_box = (face.left(), face.top(), face.right(), face.bottom())
+            points = shape_to_array(self.predictor(gray, face))
+            self._update_face(points, width, height, event)
+
+        # Reset counter if no faces detected
+        if len(faces) == 0:
+            self.cheat_counter = max(0, self.cheat_counter - 2)
+
+        event.cheat_counter = self.cheat_counter
+        self._record(event, time.perf_counter() - started)
+        self.frame_index += 1
+        return event
+
+    def _update_face(self, points: np.ndarray, width: int, height: int, event: FrameEvent):
+        """Update the session with one face's (68, 2) landmarks."""
+        cfg = self.config
+        eyes = points[EYES].reshape(2, 6, 2)
+
+        # Calculate eye centers (truncated to whole pixels per eye, as before)
+        left_center, right_center = eyes.mean(axis=1).astype(int)
+        avg_center = (int(left_center[0] + right_center[0]) // 2,
+                      int(left_center[1] + right_center[1]) // 2)
+        event.gaze_center = avg_center
+
+        # Store gaze history
+        self.gaze_history.push(avg_center)
+
+        # Calculate gaze variation
+        if len(self.gaze_history) > cfg.min_history:
+            std_x, std_y = self.gaze_history.std()
+            total_std = std_x + std_y
+            event.gaze_std = total_std
+
+            # Detect irregular gaze patterns
+            if total_std < cfg.gaze_std_threshold:
+                # Check if gaze is fixed but not centered
+                distance_from_center = math.hypot(avg_center[0] - width // 2, avg_center[1] - height // 2)
+
+                if distance_from_center > cfg.edge_distance:  # If staring at edge of screen
+                    self.cheat_counter += 2
+                else:
+                    self.cheat_counter = max(0, self.cheat_counter - 1)
+            else:
+                # Check for rapid eye movements
+                if self.gaze_history.movement_changes() > cfg.max_movement_changes:  # Too many quick movements
+                    self.cheat_counter += 1
+
+        # Eye aspect ratio for blink detection
+        avg_ear = float(eye_aspect_ratios(eyes).mean())
+        event.ear = avg_ear
+
+        # Detect conscious avoidance (eyes open but not looking at screen)
+        if avg_ear > cfg.ear_threshold:
+            # Check if eyes are looking at screen edges
+            x_ratio = avg_center[0] / width
+            if x_ratio < 0.2 or x_ratio > 0.8:
+                self.cheat_counter += 1
+
+        # Detect gaze in specific regions
+        self._update_region(avg_center)
+        event.region = self.current_region
+
+        # Detect suspicious pattern: QUESTION → ANSWER → QUESTION
+        transitions = self.region_transitions
+        if (len(transitions) >= 3 and transitions[-3] == QUESTION
+                and transitions[-2] == ANSWER and transitions[-1] == QUESTION):
+            self.cheat_counter += 1
+            event.suspicious_pattern = True
+
+        # Cheating detection logic
+        if self.cheat_counter > cfg.consecutive_frames:
+            event.cheating_detected = True
+            self.cheat_counter = cfg.consecutive_frames  # Prevent unlimited growth
+
+    def _update_region(self, gaze_center):
+        for name, region in ((QUESTION, self.config.question_region), (ANSWER, self.config.answer_region)):
+            if is_gaze_in_region(gaze_center, region):
+                if self.current_region != name:
+                    self.current_region = name
+                    self.time_in_region = 0
+                    self.region_transitions.append(name)
+                    self.transition_count += 1
+                self.time_in_region += 1
+                return
+        self.current_region = None
+        self.time_in_region = 0
+
+    def _record(self, event: FrameEvent, seconds: float):
+        summary = self._summary
+        summary.frames += 1
+        summary.processing_seconds += seconds
+        if event.faces:
+            summary.frames_with_face += 1
+        if event.cheating_detected:
+            summary.cheating_frames += 1
+            if summary.first_cheating_frame is None:
+                summary.first_cheating_frame = event.frame_index
+        if event.suspicious_pattern:
+            summary.suspicious_patterns += 1
+        if event.region is not None:
+            summary.region_frames[event.region] += 1
+        summary.max_cheat_counter = max(summary.max_cheat_counter, event.cheat_counter)
+
+    def run(self, frames: Iterable) -> Iterator[FrameEvent]:
+        """
+        Analyze every frame of *frames*, yielding one event per frame. Items may
+        be bare arrays or (timestamp, frame) pairs as produced by the readers below.
+        """
+        for item in frames:
+            if isinstance(item, tuple):
+                timestamp, frame = item
+            else:
+                timestamp, frame = None, item
+            yield self.process(frame, timestamp)
+
+    def summary(self) -> SessionSummary:
+        summary = self._summary
+        summary.region_transitions = self.transition_count
+        if summary.processing_seconds > 0:
+            summary.processing_fps = summary.frames / summary.processing_seconds
+        return summary
+
+
+# ── frame sources ──────────────────────────────────────────────
+def frames_from_video(source: Union[str, int], stride: int = 1,
+                      max_frames: Optional[int] = None) -> Iterator[tuple]:
+    """Yield (timestamp_seconds, frame) from a video file or camera index, keeping every *stride*-th frame."""
+    import cv2
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video source {source!r}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    index = emitted = 0
+    try:
+        while max_frames is None or emitted < max_frames:
+            # grab() skips decoding frames that stride leaves out
+            if not cap.grab():
+                break
+            if index % stride == 0:
+                ok, frame = cap.retrieve()
+                if ok and frame is not None and frame.size:
+                    yield index / fps, frame
+                    emitted += 1
+            index += 1
+    finally:
+        cap.release()
+
+
+def frames_from_images(pattern: Union[str, list], fps: float = 30.0) -> Iterator[tuple]:
+    """Yield (timestamp_seconds, frame) for an image directory, glob pattern or list of paths, in name order."""
+    import cv2
+
+    if isinstance(pattern, str):
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*")
+        paths = sorted(glob.glob(pattern))
+    else:
+        paths = list(pattern)
+    for index, path in enumerate(paths):
+        frame = cv2.imread(path)
+        if frame is not None:
+            yield index / fps, frame